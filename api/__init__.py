@@ -20,5 +20,5 @@ from .models import (
 
 # Version compatibility check
 import sys
-if sys.version_info < (3, 8):
-    raise RuntimeError("ATF Service requires Python 3.8 or higher")
\ No newline at end of file
+if sys.version_info < (3, 9):
+    raise RuntimeError("ATF Service requires Python 3.9 or higher")
\ No newline at end of file
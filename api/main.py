@@ -2,13 +2,19 @@ from fastapi import FastAPI, HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
+import concurrent.futures
 import logging
+import os
 from pathlib import Path
 from typing import List, Optional
 
 from .models import FeedRequest, FeedResponse, ValidationRequest, ValidationResponse
 from .routes import feeds, health, metrics
 from ..security.security import SecurityManager
+from ..tools.feed_generator import ATFGenerator
+from ..tools.validator import ATFValidator
+from ..tools.feed_manager import FeedManager
 
 app = FastAPI(
     title="ATF Service",
@@ -39,14 +45,23 @@ app.include_router(
     dependencies=[Depends(security)]
 )
 
+# Probe and scrape endpoints skip rate limiting and security headers
+_BYPASS = {"/health", "/health/ready", "/health/live", "/metrics"}
+
 @app.middleware("http")
 async def security_middleware(request, call_next):
     """Add security headers and handle rate limiting."""
+    if request.url.path in _BYPASS:
+        return await call_next(request)
+    
     # Get client identifier
-    client_id = request.headers.get("X-Client-ID", "anonymous")
+    client_id = security_manager.rate_limit_client_id(
+        request.client.host if request.client else None,
+        request.headers.get("X-Forwarded-For")
+    )
     
     # Check rate limits
-    if not security_manager.check_rate_limit(request.url.path, client_id):
+    if not await security_manager.check_rate_limit(request.url.path, client_id):
         return JSONResponse(
             status_code=429,
             content={"detail": "Rate limit exceeded"}
@@ -56,8 +71,7 @@ async def security_middleware(request, call_next):
     response = await call_next(request)
     
     # Add security headers
-    security_headers = security_manager.get_security_headers()
-    for header, value in security_headers.items():
+    for header, value in security_manager.security_headers_items:
         response.headers[header] = value
     
     return response
@@ -81,6 +95,18 @@ async def http_exception_handler(request, exc):
 async def startup_event():
     """Initialize services on startup."""
     logging.info("ATF Service starting up")
+    
+    # Size the default executor used to offload CPU-bound crypto calls
+    pool_size = int(os.getenv("THREAD_POOL_SIZE", (os.cpu_count() or 1) * 2))
+    asyncio.get_running_loop().set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(max_workers=pool_size)
+    )
+    
+    # Build expensive services once and share them across requests
+    app.state.security_manager = security_manager
+    app.state.generator = ATFGenerator()
+    app.state.validator = ATFValidator("schema/atf-1.0.xsd")
+    app.state.feed_manager = FeedManager("workspace")
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Security, Depends
+from fastapi import APIRouter, HTTPException, Security, Depends, Request, Response
 from fastapi.security import HTTPBearer
 from typing import List, Optional
+import asyncio
+import hashlib
 import uuid
 from datetime import datetime
+from lxml import etree
 
 from ..models import (
     FeedRequest,
@@ -19,12 +22,32 @@ from ...security.security import SecurityManager
 router = APIRouter()
 security = HTTPBearer()
 
+# Shared service instances are created once at startup (see api.main)
+def get_security_manager(request: Request) -> SecurityManager:
+    """Return the application-wide security manager."""
+    return request.app.state.security_manager
+
+def get_generator(request: Request) -> ATFGenerator:
+    """Return the application-wide feed generator."""
+    return request.app.state.generator
+
+def get_validator(request: Request) -> ATFValidator:
+    """Return the application-wide feed validator."""
+    return request.app.state.validator
+
+def get_feed_manager(request: Request) -> FeedManager:
+    """Return the application-wide feed manager."""
+    return request.app.state.feed_manager
+
 @router.post("/", response_model=FeedResponse)
-async def create_feed(request: FeedRequest):
+async def create_feed(
+    request: FeedRequest,
+    generator: ATFGenerator = Depends(get_generator),
+    security_manager: SecurityManager = Depends(get_security_manager)
+):
     """Create a new ATF feed."""
     try:
         # Generate feed
-        generator = ATFGenerator()
         feed_content = generator.create_feed(
             title=request.title,
             link=str(request.link),
@@ -33,15 +56,26 @@ async def create_feed(request: FeedRequest):
         
         # Add items
         for item in request.items:
-            generator.add_item(feed_content, item)
+            impact = item.impact_assessment
+            generator.add_item(
+                feed_content,
+                title=item.title,
+                link=str(item.link),
+                description=item.description,
+                categories=item.categories,
+                impact_summary=impact.summary,
+                affected_users=impact.affected_users,
+                metrics=impact.metrics,
+                pub_date=item.pub_date
+            )
         
-        # Sign feed
-        security_manager = SecurityManager("security/config.yaml")
-        signature = security_manager.sign_feed(str(feed_content))
+        # Serialize once and sign the exact bytes returned to the client
+        xml_bytes = etree.tostring(feed_content, xml_declaration=True, encoding="utf-8")
+        signature = await asyncio.to_thread(security_manager.sign_feed, xml_bytes)
         
         return FeedResponse(
             id=str(uuid.uuid4()),
-            content=str(feed_content),
+            content=xml_bytes.decode("utf-8"),
             signature=signature,
             created_at=datetime.utcnow(),
             version=request.version
@@ -50,15 +84,19 @@ async def create_feed(request: FeedRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/validate", response_model=ValidationResponse)
-async def validate_feed(request: ValidationRequest):
+async def validate_feed(
+    request: ValidationRequest,
+    validator: ATFValidator = Depends(get_validator),
+    security_manager: SecurityManager = Depends(get_security_manager)
+):
     """Validate an ATF feed."""
     try:
-        validator = ATFValidator("schema/atf-1.0.xsd")
-        errors = validator.validate_feed(request.content)
+        errors = validator.validate_bytes(request.content.encode())
         
         if request.signature:
-            security_manager = SecurityManager("security/config.yaml")
-            if not security_manager.verify_feed(request.content, request.signature):
+            if not await asyncio.to_thread(
+                security_manager.verify_feed, request.content, request.signature
+            ):
                 errors.append("Invalid feed signature")
         
         return ValidationResponse(
@@ -69,11 +107,25 @@ async def validate_feed(request: ValidationRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/compare", response_model=FeedComparison)
-async def compare_feeds(feed1: str, feed2: str):
+async def compare_feeds(
+    feed1: str,
+    feed2: str,
+    http_request: Request,
+    response: Response,
+    manager: FeedManager = Depends(get_feed_manager)
+):
     """Compare two ATF feeds."""
     try:
-        manager = FeedManager("workspace")
+        # The comparison only changes when either feed's content does
+        etag1 = manager.get_feed_etag(feed1)
+        etag2 = manager.get_feed_etag(feed2)
+        etag = '"' + hashlib.blake2b(f"{etag1}:{etag2}".encode(), digest_size=16).hexdigest() + '"'
+        if http_request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
         comparison = manager.compare_feeds(feed1, feed2)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "max-age=60, must-revalidate"
         return comparison
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,21 +1,29 @@
 #!/usr/bin/env python3
 import http.client
+import json
 import sys
 import os
 
+_HEALTHY_BODY = b'{"status":"healthy"}'
+
+def _get_health(conn):
+    """Issue GET /health on conn and return (status, body)."""
+    conn.request("GET", "/health")
+    response = conn.getresponse()
+    return response.status, response.read()
+
+def _is_healthy(body) -> bool:
+    """Check the health payload, using an exact match for the compact form."""
+    if body == _HEALTHY_BODY:
+        return True
+    return json.loads(body).get("status") == "healthy"
+
 def check_health():
     """Check if the ATF service is healthy."""
+    conn = http.client.HTTPConnection("localhost:8000", timeout=10)
     try:
-        conn = http.client.HTTPConnection("localhost:8000")
-        conn.request("GET", "/health")
-        response = conn.getresponse()
-        
-        if response.status == 200:
-            data = response.read()
-            if b'"status":"healthy"' in data:
-                return True
-            
-        return False
+        status, data = _get_health(conn)
+        return status == 200 and _is_healthy(data)
     except Exception:
         return False
     finally:
@@ -24,4 +32,4 @@ def check_health():
 if __name__ == "__main__":
     if check_health():
         sys.exit(0)
-    sys.exit(1)
\ No newline at end of file
+    sys.exit(1)
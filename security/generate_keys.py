@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import rsa, padding, ed25519
 from datetime import datetime
 import logging
 
@@ -15,47 +17,67 @@ def setup_logging():
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
-def generate_key_pair(key_size: int = 2048) -> tuple:
-    """Generate RSA key pair."""
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=key_size
-    )
+def generate_key_pair(key_size: int = 2048, algo: str = "ed25519") -> tuple:
+    """Generate an Ed25519 or RSA key pair."""
+    if algo == "ed25519":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=key_size
+        )
     public_key = private_key.public_key()
     return private_key, public_key
 
-def save_private_key(private_key, path: Path, password: str = None):
-    """Save private key with optional encryption."""
+def private_key_pem(private_key, password: str = None) -> bytes:
+    """Serialize private key to PEM with optional encryption."""
     encryption_algorithm = (
         serialization.BestAvailableEncryption(password.encode())
         if password
         else serialization.NoEncryption()
     )
-    
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=encryption_algorithm
+    )
+
+def public_key_pem(public_key) -> bytes:
+    """Serialize public key to PEM."""
+    return public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+
+def generate_pem_pair(key_size: int, algo: str, password: str = None) -> tuple:
+    """Generate a key pair and return it as PEM bytes (picklable for workers)."""
+    private_key, public_key = generate_key_pair(key_size, algo)
+    return private_key_pem(private_key, password), public_key_pem(public_key)
+
+def save_private_key(private_key, path: Path, password: str = None):
+    """Save private key with optional encryption."""
     with open(path, 'wb') as f:
-        f.write(private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=encryption_algorithm
-        ))
+        f.write(private_key_pem(private_key, password))
 
 def save_public_key(public_key, path: Path):
     """Save public key."""
     with open(path, 'wb') as f:
-        f.write(public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        ))
+        f.write(public_key_pem(public_key))
 
 def main():
-    parser = argparse.ArgumentParser(description='Generate RSA key pair for ATF feed signing')
+    parser = argparse.ArgumentParser(description='Generate key pair for ATF feed signing')
     parser.add_argument('--output-dir', type=str, default='security/keys',
                        help='Output directory for keys')
+    parser.add_argument('--algo', type=str, default='ed25519',
+                       choices=['ed25519', 'rsa'],
+                       help='Signature algorithm (default: ed25519)')
     parser.add_argument('--key-size', type=int, default=2048,
                        choices=[2048, 3072, 4096],
-                       help='Key size in bits')
+                       help='RSA key size in bits (ignored for ed25519)')
     parser.add_argument('--password', type=str,
                        help='Password for private key encryption')
+    parser.add_argument('--count', type=int, default=1,
+                       help='Number of key pairs to generate in parallel')
     
     args = parser.parse_args()
     setup_logging()
@@ -69,20 +91,39 @@ def main():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Generate keys
-        logging.info(f"Generating {args.key_size}-bit RSA key pair...")
-        private_key, public_key = generate_key_pair(args.key_size)
+        if args.algo == 'ed25519':
+            logging.info(f"Generating {args.count} Ed25519 key pair(s)...")
+        else:
+            logging.info(f"Generating {args.count} {args.key_size}-bit RSA key pair(s)...")
         
-        # Save private key
-        private_key_path = output_dir / f"atf_private_{timestamp}.pem"
-        save_private_key(private_key, private_key_path, args.password)
-        logging.info(f"Private key saved to: {private_key_path}")
+        if args.count > 1:
+            # Key generation is CPU-bound and independent, so fan out across cores
+            with ProcessPoolExecutor(max_workers=min(args.count, os.cpu_count() or 1)) as executor:
+                pem_pairs = list(executor.map(
+                    generate_pem_pair,
+                    [args.key_size] * args.count,
+                    [args.algo] * args.count,
+                    [args.password] * args.count
+                ))
+        else:
+            pem_pairs = [generate_pem_pair(args.key_size, args.algo, args.password)]
         
-        # Save public key
-        public_key_path = output_dir / f"atf_public_{timestamp}.pem"
-        save_public_key(public_key, public_key_path)
-        logging.info(f"Public key saved to: {public_key_path}")
+        for i, (private_pem, public_pem) in enumerate(pem_pairs):
+            suffix = f"{timestamp}_{i}" if args.count > 1 else timestamp
+            
+            # Save private key
+            private_key_path = output_dir / f"atf_private_{suffix}.pem"
+            with open(private_key_path, 'wb') as f:
+                f.write(private_pem)
+            logging.info(f"Private key saved to: {private_key_path}")
+            
+            # Save public key
+            public_key_path = output_dir / f"atf_public_{suffix}.pem"
+            with open(public_key_path, 'wb') as f:
+                f.write(public_pem)
+            logging.info(f"Public key saved to: {public_key_path}")
         
-        # Create symlinks to latest keys
+        # Create symlinks to latest (last generated) keys
         latest_private = output_dir / "atf_private_latest.pem"
         latest_public = output_dir / "atf_public_latest.pem"
         
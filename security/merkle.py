@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import hashlib
+from typing import List, Tuple
+
+# Proof steps are (sibling_is_left, sibling_hash) pairs from leaf to root
+ProofStep = Tuple[bool, bytes]
+
+def hash_leaf(data: bytes) -> bytes:
+    """Hash a leaf, domain-separated from internal nodes."""
+    return hashlib.sha256(b"\x00" + data).digest()
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    """Hash two child nodes into their parent."""
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def merkle_root(leaves: List[bytes]) -> Tuple[bytes, List[List[ProofStep]]]:
+    """Compute the Merkle root of the leaves and an inclusion proof for each."""
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+
+    level = [hash_leaf(leaf) for leaf in leaves]
+    proofs: List[List[ProofStep]] = [[] for _ in leaves]
+    # Leaf indices covered by each node of the current level
+    members = [[i] for i in range(len(leaves))]
+
+    while len(level) > 1:
+        next_level = []
+        next_members = []
+        for i in range(0, len(level) - 1, 2):
+            left, right = level[i], level[i + 1]
+            for leaf_index in members[i]:
+                proofs[leaf_index].append((False, right))
+            for leaf_index in members[i + 1]:
+                proofs[leaf_index].append((True, left))
+            next_level.append(hash_node(left, right))
+            next_members.append(members[i] + members[i + 1])
+
+        # An odd node out is promoted to the next level unchanged
+        if len(level) % 2:
+            next_level.append(level[-1])
+            next_members.append(members[-1])
+
+        level = next_level
+        members = next_members
+
+    return level[0], proofs
+
+def verify_proof(leaf: bytes, proof: List[ProofStep], root: bytes) -> bool:
+    """Check that a leaf is included under the given root."""
+    node = hash_leaf(leaf)
+    for sibling_is_left, sibling in proof:
+        node = hash_node(sibling, node) if sibling_is_left else hash_node(node, sibling)
+    return node == root
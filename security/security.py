@@ -1,13 +1,23 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import jwt
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ed25519
 from dataclasses import dataclass
 import time
 import yaml
 from pathlib import Path
 import logging
 from datetime import datetime, timedelta
+from collections import OrderedDict, deque
+import hashlib
+import ipaddress
+import os
+import threading
+import uuid
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis is optional; fall back to in-process limiting
+    aioredis = None
 
 @dataclass
 class SecurityConfig:
@@ -19,13 +29,48 @@ class SecurityConfig:
     encryption: Dict
     audit: Dict
 
+# Sliding-window rate limit: trim, record, count and expire in one round trip
+RATE_LIMIT_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+redis.call('ZADD', key, now, ARGV[3])
+local count = redis.call('ZCARD', key)
+redis.call('PEXPIRE', key, window)
+return count
+"""
+
 class SecurityManager:
     """Manages security features for the ATF service."""
     
+    # Maximum number of cached signature verification results
+    VERIFY_CACHE_SIZE = 1024
+    
+    # Maximum number of cached decoded JWT payloads
+    JWT_CACHE_SIZE = 1024
+    
+    # Configured rates are requests per minute
+    RATE_LIMIT_WINDOW_MS = 60_000
+    
+    # Maximum number of in-memory rate-limit windows (endpoint, client pairs)
+    RATE_LIMIT_MAX_WINDOWS = 10_000
+    
     def __init__(self, config_path: Path):
         """Initialize security manager with configuration."""
         self.config = self._load_config(config_path)
         self.logger = logging.getLogger(__name__)
+        
+        # Headers depend only on configuration, so build them once
+        self._security_headers = self._build_security_headers()
+        self.security_headers_items = tuple(self._security_headers.items())
+        
+        self._verify_cache: "OrderedDict[bytes, bool]" = OrderedDict()
+        self._verify_lock = threading.Lock()
+        self._jwt_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._rate_windows: "OrderedDict[str, deque]" = OrderedDict()
+        self._rate_lock = threading.Lock()
+        self._init_rate_limiter()
         self._init_keys()
     
     def _load_config(self, config_path: Path) -> SecurityConfig:
@@ -41,56 +86,159 @@ class SecurityManager:
             audit=config['audit']
         )
     
+    def _init_rate_limiter(self):
+        """Initialize the Redis rate-limit backend when configured."""
+        self.redis = None
+        self._rate_limit_script = None
+        self._trusted_proxies = tuple(
+            ipaddress.ip_network(network)
+            for network in self.config.rate_limits.get('trusted_proxies', [])
+        )
+        
+        redis_url = self.config.rate_limits.get('redis_url') or os.environ.get('REDIS_URL')
+        if not redis_url:
+            return
+        if aioredis is None:
+            self.logger.warning("REDIS_URL set but redis is not installed; using in-memory rate limiting")
+            return
+        
+        self.redis = aioredis.from_url(redis_url)
+        self._rate_limit_script = self.redis.register_script(RATE_LIMIT_SCRIPT)
+    
     def _init_keys(self):
         """Initialize cryptographic keys."""
-        self.signing_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=self.config.feed_auth['signatures']['key_size']
-        )
+        self.signing_key = ed25519.Ed25519PrivateKey.generate()
         self.public_key = self.signing_key.public_key()
     
-    def sign_feed(self, feed_content: str) -> str:
-        """Sign feed content with RSA key."""
-        signature = self.signing_key.sign(
-            feed_content.encode(),
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
-        return signature.hex()
+    def _sign_bytes(self, data: bytes) -> bytes:
+        """Sign raw bytes with the Ed25519 signing key."""
+        return self.signing_key.sign(data)
+    
+    def _verify_bytes(self, signature: bytes, data: bytes):
+        """Verify an Ed25519 signature, raising on failure."""
+        self.public_key.verify(signature, data)
     
-    def verify_feed(self, feed_content: str, signature: str) -> bool:
-        """Verify feed signature."""
+    def sign_feed(self, feed_content: Union[str, bytes]) -> str:
+        """Sign feed content."""
+        if isinstance(feed_content, str):
+            feed_content = feed_content.encode()
+        return self._sign_bytes(feed_content).hex()
+    
+    def verify_feed(self, feed_content: Union[str, bytes], signature: str) -> bool:
+        """Verify feed signature, reusing cached results for repeated pairs."""
+        if isinstance(feed_content, str):
+            feed_content = feed_content.encode()
+        cache_key = hashlib.blake2b(
+            signature.encode() + b"|" + feed_content,
+            digest_size=16
+        ).digest()
+        
+        with self._verify_lock:
+            cached = self._verify_cache.get(cache_key)
+            if cached is not None:
+                self._verify_cache.move_to_end(cache_key)
+                return cached
+        
         try:
-            self.public_key.verify(
-                bytes.fromhex(signature),
-                feed_content.encode(),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
-            return True
+            self._verify_bytes(bytes.fromhex(signature), feed_content)
+            result = True
         except Exception as e:
             self.logger.warning(f"Signature verification failed: {e}")
+            result = False
+        
+        # Negative results are cached too so repeated bad signatures stay cheap
+        with self._verify_lock:
+            self._verify_cache[cache_key] = result
+            if len(self._verify_cache) > self.VERIFY_CACHE_SIZE:
+                self._verify_cache.popitem(last=False)
+        
+        return result
+    
+    def rate_limit_client_id(self, peer: Optional[str],
+                             forwarded_for: Optional[str] = None) -> str:
+        """Identify a client for rate limiting by its network address.
+        
+        Client-supplied IDs are not used, since rotating them would evade
+        the limit. X-Forwarded-For is only honoured when the peer is a
+        trusted proxy, taking the rightmost hop that is not one.
+        """
+        if not peer:
+            return "unknown"
+        if forwarded_for and self._is_trusted_proxy(peer):
+            for hop in reversed(forwarded_for.split(",")):
+                hop = hop.strip()
+                if hop and not self._is_trusted_proxy(hop):
+                    return hop
+        return peer
+    
+    def _is_trusted_proxy(self, address: str) -> bool:
+        """Check whether an address falls in a configured trusted proxy range."""
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
             return False
+        return any(ip in network for network in self._trusted_proxies)
     
-    def check_rate_limit(self, endpoint: str, client_id: str) -> bool:
-        """Check if request is within rate limits."""
+    async def check_rate_limit(self, endpoint: str, client_id: str) -> bool:
+        """Check if request is within rate limits (sliding window)."""
         limits = self.config.rate_limits['endpoints'].get(
             endpoint,
             self.config.rate_limits['default']
         )
+        key = f"rl:{endpoint}:{client_id}"
+        now = int(time.time() * 1000)
         
-        # Implementation would use Redis or similar for rate tracking
-        # This is a placeholder
-        return True
+        if self._rate_limit_script is not None:
+            try:
+                count = await self._rate_limit_script(
+                    keys=[key],
+                    args=[now, self.RATE_LIMIT_WINDOW_MS, f"{now}-{uuid.uuid4().hex}"]
+                )
+                return int(count) <= limits['rate']
+            except Exception as e:
+                self.logger.warning(f"Redis rate limiting failed, using in-memory fallback: {e}")
+        
+        return self._check_rate_limit_local(key, now, limits['rate'])
+    
+    def _check_rate_limit_local(self, key: str, now: int, rate: int) -> bool:
+        """In-process sliding-window rate limiting.
+        
+        Windows are kept in least-recently-used order. Any address can
+        open a window, so idle windows are dropped and the number kept is
+        capped rather than letting clients grow the dict without bound.
+        """
+        windows = self._rate_windows
+        cutoff = now - self.RATE_LIMIT_WINDOW_MS
+        with self._rate_lock:
+            window = windows.get(key)
+            if window is None:
+                window = windows[key] = deque()
+            else:
+                windows.move_to_end(key)
+                while window and window[0] <= cutoff:
+                    window.popleft()
+            window.append(now)
+            allowed = len(window) <= rate
+            
+            # The oldest windows were used least recently; drop those that
+            # have gone idle, then any beyond the cap
+            while windows:
+                oldest = next(iter(windows.values()))
+                if oldest[-1] > cutoff and len(windows) <= self.RATE_LIMIT_MAX_WINDOWS:
+                    break
+                windows.popitem(last=False)
+            return allowed
     
     def validate_jwt(self, token: str) -> Optional[Dict]:
-        """Validate JWT token."""
+        """Validate JWT token, reusing decoded payloads until they expire."""
+        with self._verify_lock:
+            payload = self._jwt_cache.get(token)
+            if payload is not None:
+                if payload.get('exp', 0) > time.time():
+                    self._jwt_cache.move_to_end(token)
+                    return dict(payload)
+                del self._jwt_cache[token]
+        
         try:
             payload = jwt.decode(
                 token,
@@ -98,10 +246,17 @@ class SecurityManager:
                 algorithms=self.config.access_control['jwt']['algorithms'],
                 audience=self.config.access_control['jwt']['audience']
             )
-            return payload
         except jwt.InvalidTokenError as e:
             self.logger.warning(f"JWT validation failed: {e}")
             return None
+        
+        # Only tokens with an expiry are cached so revocation-by-expiry holds
+        if 'exp' in payload:
+            with self._verify_lock:
+                self._jwt_cache[token] = dict(payload)
+                if len(self._jwt_cache) > self.JWT_CACHE_SIZE:
+                    self._jwt_cache.popitem(last=False)
+        return payload
     
     def generate_jwt(self, claims: Dict) -> str:
         """Generate new JWT token."""
@@ -111,10 +266,14 @@ class SecurityManager:
             'iat': int(time.time()),
             'exp': int(time.time() + 3600)  # 1 hour expiry
         })
-        return jwt.encode(claims, self.signing_key, algorithm='RS256')
+        return jwt.encode(claims, self.signing_key, algorithm='EdDSA')
     
     def get_security_headers(self) -> Dict[str, str]:
         """Get security headers for HTTP responses."""
+        return self._security_headers
+    
+    def _build_security_headers(self) -> Dict[str, str]:
+        """Build security headers from the content security configuration."""
         headers = {}
         
         # Add CSP headers
@@ -157,6 +316,11 @@ class SecurityManager:
         old_key = self.signing_key
         self._init_keys()
         
+        # Cached results were computed against the old public key
+        with self._verify_lock:
+            self._verify_cache.clear()
+            self._jwt_cache.clear()
+        
         # Implementation would handle key transition period
         # This is a placeholder
         self.audit_log('key_rotation', {
@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 
 import argparse
+import functools
 import sys
 from pathlib import Path
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import padding, ed25519
 import logging
 import json
 from datetime import datetime
 import base64
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    from .merkle import merkle_root, verify_proof
+except ImportError:  # Run as a script from the security directory
+    from merkle import merkle_root, verify_proof
 
 def setup_logging():
     """Configure logging."""
@@ -17,28 +25,72 @@ def setup_logging():
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
-def load_private_key(key_path: Path, password: str = None) -> serialization.PrivateKeyTypes:
-    """Load private key from file."""
-    with open(key_path, 'rb') as f:
+@functools.lru_cache(maxsize=4)
+def _load_key_pair_cached(path_str: str, password: Optional[str]) -> tuple:
+    """Load and parse a private key once per (path, password)."""
+    with open(path_str, 'rb') as f:
         private_key = serialization.load_pem_private_key(
             f.read(),
             password=password.encode() if password else None
         )
-    return private_key
+    return private_key, private_key.public_key()
 
-def sign_feed(feed_content: str, private_key: serialization.PrivateKeyTypes) -> str:
-    """Sign feed content with private key."""
-    signature = private_key.sign(
-        feed_content.encode(),
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()
+def load_private_key(key_path: Path, password: str = None) -> serialization.PrivateKeyTypes:
+    """Load private key from file."""
+    return _load_key_pair_cached(str(Path(key_path).resolve()), password)[0]
+
+def load_public_key(key_path: Path, password: str = None):
+    """Load the public half of a private key file."""
+    return _load_key_pair_cached(str(Path(key_path).resolve()), password)[1]
+
+def _pss_padding() -> padding.PSS:
+    """RSA-PSS padding used for legacy RSA keys."""
+    return padding.PSS(
+        mgf=padding.MGF1(hashes.SHA256()),
+        salt_length=padding.PSS.MAX_LENGTH
     )
+
+def sign_bytes(data: bytes, private_key: serialization.PrivateKeyTypes) -> str:
+    """Sign raw bytes with private key (Ed25519, or RSA-PSS for RSA keys)."""
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        signature = private_key.sign(data)
+    else:
+        signature = private_key.sign(data, _pss_padding(), hashes.SHA256())
     return base64.b64encode(signature).decode()
 
-def save_signature(feed_path: Path, signature: str):
+def verify_bytes(data: bytes, signature: str, public_key) -> None:
+    """Verify a signature over raw bytes, raising on failure."""
+    signature_bytes = base64.b64decode(signature)
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        public_key.verify(signature_bytes, data)
+    else:
+        public_key.verify(signature_bytes, data, _pss_padding(), hashes.SHA256())
+
+def sign_feed(feed_content: str, private_key: serialization.PrivateKeyTypes) -> str:
+    """Sign feed content with private key."""
+    return sign_bytes(feed_content.encode(), private_key)
+
+def verify_feed(feed_content: str, signature: str, public_key) -> None:
+    """Verify a feed signature, raising on failure."""
+    verify_bytes(feed_content.encode(), signature, public_key)
+
+def sign_feeds(feed_contents: List[str], private_key: serialization.PrivateKeyTypes) -> tuple:
+    """Sign many feeds with one signature over their Merkle root.
+    
+    Returns the root signature, the root and an inclusion proof per feed.
+    """
+    root, proofs = merkle_root([content.encode() for content in feed_contents])
+    return sign_bytes(root, private_key), root, proofs
+
+def verify_batch_feed(feed_content: str, signature: str, root: bytes,
+                      proof: list, public_key) -> None:
+    """Verify a batch-signed feed, raising on failure."""
+    if not verify_proof(feed_content.encode(), proof, root):
+        raise ValueError("Feed is not included in the signed Merkle root")
+    verify_bytes(root, signature, public_key)
+
+def save_signature(feed_path: Path, signature: str,
+                   batch: Optional[Dict] = None):
     """Save signature alongside feed file."""
     signature_path = feed_path.with_suffix('.sig')
     metadata = {
@@ -46,15 +98,23 @@ def save_signature(feed_path: Path, signature: str):
         "timestamp": datetime.utcnow().isoformat(),
         "feed_file": feed_path.name
     }
+    if batch:
+        metadata["batch"] = batch
     
     with open(signature_path, 'w') as f:
         json.dump(metadata, f, indent=2)
     return signature_path
 
+def _read_text(path: Path) -> str:
+    """Read a feed file."""
+    with open(path) as f:
+        return f.read()
+
 def main():
-    parser = argparse.ArgumentParser(description='Sign ATF feed file')
-    parser.add_argument('feed_file', type=str,
-                       help='Path to the feed XML file')
+    parser = argparse.ArgumentParser(description='Sign ATF feed files')
+    parser.add_argument('feed_files', type=str, nargs='+',
+                       help='Path(s) to the feed XML file(s); several files '
+                            'are signed together over a Merkle root')
     parser.add_argument('--key', type=str,
                        default='security/keys/atf_private_latest.pem',
                        help='Path to private key file')
@@ -68,41 +128,52 @@ def main():
     
     try:
         # Load feed content
-        feed_path = Path(args.feed_file)
-        if not feed_path.exists():
-            raise FileNotFoundError(f"Feed file not found: {feed_path}")
+        feed_paths = [Path(feed_file) for feed_file in args.feed_files]
+        for feed_path in feed_paths:
+            if not feed_path.exists():
+                raise FileNotFoundError(f"Feed file not found: {feed_path}")
         
-        with open(feed_path) as f:
-            feed_content = f.read()
+        if len(feed_paths) == 1:
+            feed_contents = [_read_text(feed_paths[0])]
+        else:
+            with ThreadPoolExecutor() as pool:
+                feed_contents = list(pool.map(_read_text, feed_paths))
         
         # Load private key
         logging.info("Loading private key...")
         key_path = Path(args.key)
         private_key = load_private_key(key_path, args.password)
+        public_key = load_public_key(key_path, args.password)
         
-        # Sign feed
-        logging.info("Signing feed...")
-        signature = sign_feed(feed_content, private_key)
-        
-        # Save signature
-        signature_path = save_signature(feed_path, signature)
-        logging.info(f"Signature saved to: {signature_path}")
+        if len(feed_paths) == 1:
+            # Sign feed
+            logging.info("Signing feed...")
+            signature = sign_feed(feed_contents[0], private_key)
+            signature_path = save_signature(feed_paths[0], signature)
+            logging.info(f"Signature saved to: {signature_path}")
+        else:
+            # One signature over the Merkle root covers every feed
+            logging.info(f"Signing {len(feed_paths)} feeds...")
+            signature, root, proofs = sign_feeds(feed_contents, private_key)
+            for feed_path, proof in zip(feed_paths, proofs):
+                signature_path = save_signature(feed_path, signature, {
+                    "merkle_root": root.hex(),
+                    "proof": [
+                        {"side": "left" if is_left else "right", "hash": sibling.hex()}
+                        for is_left, sibling in proof
+                    ]
+                })
+                logging.info(f"Signature saved to: {signature_path}")
         
         # Verify signature if requested
         if args.verify:
             logging.info("Verifying signature...")
-            public_key = private_key.public_key()
             try:
-                signature_bytes = base64.b64decode(signature)
-                public_key.verify(
-                    signature_bytes,
-                    feed_content.encode(),
-                    padding.PSS(
-                        mgf=padding.MGF1(hashes.SHA256()),
-                        salt_length=padding.PSS.MAX_LENGTH
-                    ),
-                    hashes.SHA256()
-                )
+                if len(feed_paths) == 1:
+                    verify_feed(feed_contents[0], signature, public_key)
+                else:
+                    for feed_content, proof in zip(feed_contents, proofs):
+                        verify_batch_feed(feed_content, signature, root, proof, public_key)
                 logging.info("Signature verified successfully")
             except Exception as e:
                 logging.error(f"Signature verification failed: {e}")
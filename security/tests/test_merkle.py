@@ -0,0 +1,66 @@
+import pytest
+from merkle import hash_leaf, hash_node, merkle_root, verify_proof
+
+# Helpers
+def leaves(count):
+    return [f'feed-{i}'.encode() for i in range(count)]
+
+# Merkle Root Tests
+class TestMerkleRoot:
+    def test_single_leaf(self):
+        """A single leaf is its own root with an empty proof."""
+        root, proofs = merkle_root([b'feed'])
+        assert root == hash_leaf(b'feed')
+        assert proofs == [[]]
+
+    def test_two_leaves(self):
+        """Two leaves hash into one parent."""
+        root, proofs = merkle_root([b'a', b'b'])
+        assert root == hash_node(hash_leaf(b'a'), hash_leaf(b'b'))
+        assert proofs == [[(False, hash_leaf(b'b'))], [(True, hash_leaf(b'a'))]]
+
+    def test_odd_leaf_is_promoted(self):
+        """An odd leaf out is carried up unchanged."""
+        root, proofs = merkle_root([b'a', b'b', b'c'])
+        assert root == hash_node(hash_node(hash_leaf(b'a'), hash_leaf(b'b')),
+                                 hash_leaf(b'c'))
+        assert len(proofs[2]) == 1
+
+    def test_empty_leaves(self):
+        """Building a tree without leaves is an error."""
+        with pytest.raises(ValueError):
+            merkle_root([])
+
+    def test_leaf_and_node_hashes_differ(self):
+        """Leaves and nodes are domain-separated."""
+        left, right = hash_leaf(b'a'), hash_leaf(b'b')
+        assert hash_leaf(left + right) != hash_node(left, right)
+
+# Inclusion Proof Tests
+class TestVerifyProof:
+    @pytest.mark.parametrize('count', [1, 2, 3, 4, 5, 7, 8, 13])
+    def test_every_leaf_verifies(self, count):
+        """Each leaf verifies against the root with its own proof."""
+        data = leaves(count)
+        root, proofs = merkle_root(data)
+        for leaf, proof in zip(data, proofs):
+            assert verify_proof(leaf, proof, root)
+
+    def test_tampered_leaf_fails(self):
+        """Changed content does not verify."""
+        data = leaves(5)
+        root, proofs = merkle_root(data)
+        assert not verify_proof(b'tampered', proofs[0], root)
+
+    def test_wrong_proof_fails(self):
+        """A proof for another leaf does not verify."""
+        data = leaves(5)
+        root, proofs = merkle_root(data)
+        assert not verify_proof(data[0], proofs[1], root)
+
+    def test_wrong_root_fails(self):
+        """A proof does not verify against a different root."""
+        data = leaves(4)
+        root, proofs = merkle_root(data)
+        other_root, _ = merkle_root(leaves(5))
+        assert not verify_proof(data[0], proofs[0], other_root)
@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+import yaml
+from pathlib import Path
+from security import SecurityManager
+
+# Fixtures for test setup
+@pytest.fixture
+def config_path():
+    return Path(__file__).parent.parent / 'config.yaml'
+
+@pytest.fixture
+def manager(config_path, monkeypatch):
+    monkeypatch.delenv('REDIS_URL', raising=False)
+    return SecurityManager(config_path)
+
+class FakeRateLimitScript:
+    """Stands in for the registered Redis script, returning preset counts."""
+    def __init__(self, counts=None, error=None):
+        self.counts = list(counts or [])
+        self.error = error
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        if self.error is not None:
+            raise self.error
+        return self.counts.pop(0)
+
+# Local Rate Limiting Tests
+class TestLocalRateLimit:
+    def test_allows_up_to_rate(self, manager):
+        """Requests within the configured rate pass, the next one is refused."""
+        results = [asyncio.run(manager.check_rate_limit('/validate', 'client'))
+                   for _ in range(31)]
+        assert all(results[:30])
+        assert not results[30]
+
+    def test_window_slides(self, manager):
+        """Requests older than the window no longer count."""
+        window = manager.RATE_LIMIT_WINDOW_MS
+        assert manager._check_rate_limit_local('k', 0, 1)
+        assert not manager._check_rate_limit_local('k', 1, 1)
+        assert manager._check_rate_limit_local('k', window + 1, 1)
+
+    def test_idle_windows_are_dropped(self, manager):
+        """Windows without requests in the last window are removed."""
+        window = manager.RATE_LIMIT_WINDOW_MS
+        for i in range(100):
+            manager._check_rate_limit_local(f'client-{i}', 0, 10)
+        manager._check_rate_limit_local('late', window + 1, 10)
+        assert list(manager._rate_windows) == ['late']
+
+    def test_window_count_is_bounded(self, manager, monkeypatch):
+        """Rotating client IDs cannot grow the windows beyond the cap."""
+        monkeypatch.setattr(SecurityManager, 'RATE_LIMIT_MAX_WINDOWS', 10)
+        for i in range(50):
+            manager._check_rate_limit_local(f'client-{i}', i, 10)
+        assert len(manager._rate_windows) == 10
+        assert 'client-49' in manager._rate_windows
+
+# Client Identification Tests
+class TestRateLimitClientId:
+    def test_anonymous_clients_get_separate_windows(self, manager):
+        """Clients at different addresses do not share a window."""
+        first = manager.rate_limit_client_id('203.0.113.1')
+        second = manager.rate_limit_client_id('203.0.113.2')
+        for _ in range(30):
+            assert asyncio.run(manager.check_rate_limit('/validate', first))
+        assert not asyncio.run(manager.check_rate_limit('/validate', first))
+        assert asyncio.run(manager.check_rate_limit('/validate', second))
+
+    def test_forwarded_for_ignored_from_untrusted_peer(self, manager):
+        """Clients cannot pick their own identity with X-Forwarded-For."""
+        assert manager.rate_limit_client_id('203.0.113.1', '198.51.100.7') == '203.0.113.1'
+
+    def test_forwarded_for_from_trusted_proxy(self, config_path, tmp_path, monkeypatch):
+        """Behind a trusted proxy the rightmost untrusted hop is the client."""
+        config = yaml.safe_load(config_path.read_text())
+        config['security']['rate_limiting']['trusted_proxies'] = ['10.0.0.0/8']
+        proxied_config = tmp_path / 'config.yaml'
+        proxied_config.write_text(yaml.safe_dump(config))
+        monkeypatch.delenv('REDIS_URL', raising=False)
+        manager = SecurityManager(proxied_config)
+        forwarded_for = '192.0.2.9, 198.51.100.7, 10.0.0.3'
+        assert manager.rate_limit_client_id('10.0.0.2', forwarded_for) == '198.51.100.7'
+
+    def test_missing_peer(self, manager):
+        """Requests without a peer address share one identity."""
+        assert manager.rate_limit_client_id(None) == 'unknown'
+
+# Redis Rate Limiting Tests
+class TestRedisRateLimit:
+    def test_uses_script_count(self, manager):
+        """The count returned by the Lua script decides the outcome."""
+        script = FakeRateLimitScript(counts=[30, 31])
+        manager._rate_limit_script = script
+        assert asyncio.run(manager.check_rate_limit('/validate', 'client'))
+        assert not asyncio.run(manager.check_rate_limit('/validate', 'client'))
+        keys, args = script.calls[0]
+        assert keys == ['rl:/validate:client']
+        assert args[1] == manager.RATE_LIMIT_WINDOW_MS
+        # Each request is recorded under a unique member
+        assert script.calls[0][1][2] != script.calls[1][1][2]
+        assert not manager._rate_windows
+
+    def test_falls_back_to_local_on_error(self, manager):
+        """Redis failures fall back to in-process limiting."""
+        manager._rate_limit_script = FakeRateLimitScript(error=ConnectionError("down"))
+        assert asyncio.run(manager.check_rate_limit('/validate', 'client'))
+        assert 'rl:/validate:client' in manager._rate_windows
@@ -5,22 +5,142 @@ import sys
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Set
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+from lxml import etree as ET
+from lxml.builder import ElementMaker
 import logging
 from dataclasses import dataclass, field
+from collections import Counter
+from functools import partial
+from types import MappingProxyType
+from array import array
 import copy
+import heapq
+import string
 
-@dataclass
+# Slotted dataclasses need Python 3.10+; older versions keep __dict__ storage
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# ATF timestamps are fixed-width ISO 8601 UTC, so they also order correctly as text
+_PUBDATE_FMT = "%Y-%m-%dT%H:%M:%SZ"
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    from rapidfuzz import process
+    from rapidfuzz.distance import Levenshtein
+except ImportError:  # RapidFuzz is optional; fall back to the pure-Python DP
+    process = None
+    Levenshtein = None
+
+# Numba is optional and only used when RapidFuzz is missing, so it is not
+# even imported (or its kernel compiled) otherwise
+numba = None
+np = None
+if Levenshtein is None:
+    try:
+        import numba
+        import numpy as np
+    except ImportError:
+        numba = None
+        np = None
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _levenshtein_kernel(a, b):
+        """Levenshtein distance between two code point arrays, two rows at a time."""
+        n = b.shape[0]
+        previous = np.empty(n + 1, dtype=np.int32)
+        current = np.empty(n + 1, dtype=np.int32)
+        for j in range(n + 1):
+            previous[j] = j
+        
+        for i in range(a.shape[0]):
+            current[0] = i + 1
+            c1 = a[i]
+            for j in range(n):
+                best = previous[j] + (1 if c1 != b[j] else 0)
+                if previous[j + 1] + 1 < best:
+                    best = previous[j + 1] + 1
+                if current[j] + 1 < best:
+                    best = current[j] + 1
+                current[j + 1] = best
+            previous, current = current, previous
+        return previous[n]
+    
+    def _codepoints(s: str):
+        """View a string as an array of code points for the kernel."""
+        return np.frombuffer(s.encode("utf-32-le"), dtype=np.uint32)
+    
+    # Compile (or load from the on-disk cache) at import, not on first match
+    _levenshtein_kernel(_codepoints("ab"), _codepoints("ba"))
+else:
+    _levenshtein_kernel = None
+
+def _bigrams(s: str) -> Counter:
+    """Count the character bigrams of a string."""
+    return Counter(s[i:i + 2] for i in range(len(s) - 1))
+
+def _compile_template(template: str) -> Callable[[Dict[str, str]], str]:
+    """Compile a str.format template into a function of the template data.
+    
+    Templates with only plain {name} fields are translated once into an
+    equivalent %-style mapping format; anything else falls back to str.format.
+    """
+    parts = list(string.Formatter().parse(template))
+    if any(name is not None and (not name.isidentifier() or spec or conversion)
+           for _, name, spec, conversion in parts):
+        return lambda data: template.format(**data)
+    
+    fmt = "".join(
+        literal.replace("%", "%%") + (f"%({name})s" if name is not None else "")
+        for literal, name, _, _ in parts
+    )
+    return fmt.__mod__
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class UpdateTemplate:
-    """Template for common update types."""
+    """Template for common update types.
+    
+    Templates are immutable, so generators can share them without copying.
+    Metrics may be given as a mapping; they are stored as (name, template)
+    pairs so templates stay hashable and picklable.
+    """
     name: str
-    categories: List[str]
+    categories: Tuple[str, ...]
     description_template: str
     impact_template: str
-    metrics: Dict[str, str] = field(default_factory=dict)
-    required_fields: Set[str] = field(default_factory=set)
+    metrics: Tuple[Tuple[str, str], ...] = ()
+    required_fields: FrozenSet[str] = frozenset()
+    
+    # Compiled forms of the templates above, built once in __post_init__
+    _description_fn: Callable[[Dict[str, str]], str] = field(init=False, repr=False, compare=False)
+    _impact_fn: Callable[[Dict[str, str]], str] = field(init=False, repr=False, compare=False)
+    _metric_fns: Dict[str, Callable[[Dict[str, str]], str]] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Accept any iterables, but store immutable copies
+        set_field = partial(object.__setattr__, self)
+        set_field('categories', tuple(self.categories))
+        set_field('metrics', tuple(dict(self.metrics).items()))
+        set_field('required_fields', frozenset(self.required_fields))
+        
+        set_field('_description_fn', _compile_template(self.description_template))
+        set_field('_impact_fn', _compile_template(self.impact_template))
+        set_field('_metric_fns', {name: _compile_template(t) for name, t in self.metrics})
+    
+    def __reduce__(self):
+        # The compiled formatters may be lambdas; rebuild them instead of pickling
+        return (self.__class__, (self.name, self.categories, self.description_template,
+                                 self.impact_template, self.metrics, self.required_fields))
+    
+    @property
+    def metric_templates(self) -> Mapping[str, str]:
+        """Read-only name -> template view of the metrics."""
+        return MappingProxyType(dict(self.metrics))
 
 class EnhancedATFGenerator:
     """Enhanced generator for Algorithmic Transparency Feed (ATF) files."""
@@ -39,11 +159,14 @@ class EnhancedATFGenerator:
         'Performance'
     }
     
+    # Minimum similarity for suggesting a standard category
+    CATEGORY_MATCH_THRESHOLD = 0.8
+    
     # Common update templates
     DEFAULT_TEMPLATES = {
         'ranking_update': UpdateTemplate(
             name="Ranking Algorithm Update",
-            categories=['Ranking Algorithm'],
+            categories=('Ranking Algorithm',),
             description_template="Updated {algorithm_name} ranking algorithm to improve {improvement_area}.",
             impact_template="Improved ranking performance for {affected_segment} of users.",
             metrics={
@@ -51,11 +174,11 @@ class EnhancedATFGenerator:
                 'Query Success Rate': '+{success_rate_improvement}%',
                 'Processing Time': '{processing_time_change}%'
             },
-            required_fields={'algorithm_name', 'improvement_area', 'affected_segment'}
+            required_fields=frozenset({'algorithm_name', 'improvement_area', 'affected_segment'})
         ),
         'privacy_enhancement': UpdateTemplate(
             name="Privacy Enhancement",
-            categories=['Privacy Enhancement', 'Security'],
+            categories=('Privacy Enhancement', 'Security'),
             description_template="Enhanced privacy protections in {system_name} using {technology}.",
             impact_template="Strengthened data protection while maintaining system functionality.",
             metrics={
@@ -63,11 +186,11 @@ class EnhancedATFGenerator:
                 'Data Utility': '{utility}%',
                 'Processing Overhead': '+{overhead}%'
             },
-            required_fields={'system_name', 'technology', 'epsilon'}
+            required_fields=frozenset({'system_name', 'technology', 'epsilon'})
         ),
         'content_moderation': UpdateTemplate(
             name="Content Moderation Update",
-            categories=['Content Moderation', 'Machine Learning'],
+            categories=('Content Moderation', 'Machine Learning'),
             description_template="Updated content moderation system with improved {feature_type} detection.",
             impact_template="Enhanced detection accuracy while reducing false positives.",
             metrics={
@@ -75,35 +198,90 @@ class EnhancedATFGenerator:
                 'False Positive Rate': '{false_positive_change}%',
                 'Processing Latency': '{latency_change}%'
             },
-            required_fields={'feature_type'}
+            required_fields=frozenset({'feature_type'})
         )
     }
     
     def __init__(self):
         """Initialize the ATF generator."""
         self.namespace = "https://www.algorithmictransparency.gov/atf"
-        self.nsmap = {"": self.namespace}
-        ET.register_namespace("", self.namespace)
-        self.templates = copy.deepcopy(self.DEFAULT_TEMPLATES)
+        self.nsmap = {None: self.namespace}
+        self.maker = ElementMaker(namespace=self.namespace, nsmap=self.nsmap)
+        self.templates = dict(self.DEFAULT_TEMPLATES)
         self.logger = logging.getLogger(__name__)
+        
+        # Standard categories in a fixed order with their lowercase forms
+        self._std_categories = tuple(self.STANDARD_CATEGORIES)
+        self._std_categories_lower = tuple(c.lower() for c in self._std_categories)
+        self._std_bigrams = tuple(_bigrams(c) for c in self._std_categories_lower)
+        self._std_cache: Dict[str, str] = {}
     
     def create_feed(self, 
                    title: str,
                    link: str,
                    description: str,
-                   language: str = "en-us") -> ET.Element:
+                   language: str = "en-us") -> ET._Element:
         """Create a new ATF feed with basic channel information."""
-        atf = ET.Element("atf", {"version": "1.0"})
+        tag = self._tag
+        atf = ET.Element(tag("atf"), version="1.0", nsmap=self.nsmap)
         
-        channel = ET.SubElement(atf, "channel")
-        ET.SubElement(channel, "title").text = title
-        ET.SubElement(channel, "link").text = link
-        ET.SubElement(channel, "description").text = description
-        ET.SubElement(channel, "lastBuildDate").text = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-        ET.SubElement(channel, "language").text = language
+        channel = ET.SubElement(atf, tag("channel"))
+        ET.SubElement(channel, tag("title")).text = title
+        ET.SubElement(channel, tag("link")).text = link
+        ET.SubElement(channel, tag("description")).text = description
+        ET.SubElement(channel, tag("lastBuildDate")).text = datetime.utcnow().strftime(_PUBDATE_FMT)
+        ET.SubElement(channel, tag("language")).text = language
         
         return atf
     
+    def add_item(self,
+                feed: ET._Element,
+                title: str,
+                link: str,
+                description: str,
+                categories: List[str],
+                impact_summary: str,
+                affected_users: str,
+                metrics: Optional[Dict[str, str]] = None,
+                pub_date: Optional[Union[datetime, str]] = None) -> ET._Element:
+        """Add a new item to the feed."""
+        if pub_date is None:
+            pub_date = datetime.utcnow()
+        if isinstance(pub_date, datetime):
+            pub_date = pub_date.strftime(_PUBDATE_FMT)
+        
+        tag = self._tag
+        
+        # The feed was last built no earlier than its newest item
+        last_build = feed.find(f'{tag("channel")}/{tag("lastBuildDate")}')
+        if last_build is not None and (last_build.text or "") < pub_date:
+            last_build.text = pub_date
+        
+        SubElement = ET.SubElement
+        item = SubElement(feed, tag("item"))
+        SubElement(item, tag("title")).text = title
+        SubElement(item, tag("link")).text = link
+        SubElement(item, tag("pubDate")).text = pub_date
+        
+        categories_elem = SubElement(item, tag("categories"))
+        for category in categories:
+            SubElement(categories_elem, tag("category")).text = category
+        
+        SubElement(item, tag("description")).text = description
+        
+        impact = SubElement(item, tag("impactAssessment"))
+        SubElement(impact, tag("summary")).text = impact_summary
+        SubElement(impact, tag("affectedUsers")).text = affected_users
+        if metrics:
+            E = self.maker
+            impact.append(E.metrics(*[E.metric(value, name=name) for name, value in metrics.items()]))
+        
+        return item
+    
+    def _tag(self, name: str) -> str:
+        """Return the namespace-qualified tag for an ATF element."""
+        return f"{{{self.namespace}}}{name}"
+    
     def add_template(self, name: str, template: UpdateTemplate):
         """Add a new template for updates."""
         self.templates[name] = template
@@ -117,47 +295,101 @@ class EnhancedATFGenerator:
         if category in self.STANDARD_CATEGORIES:
             return category
         
+        # Matching is deterministic, so each distinct category is resolved once
+        cached = self._std_cache.get(category)
+        if cached is not None:
+            return cached
+        
+        standardized = self._match_category(category)
+        self._std_cache[category] = standardized
+        return standardized
+    
+    def _match_category(self, category: str) -> str:
+        """Find the closest standard category, or keep the given one."""
         # Find closest match
         closest = None
         max_similarity = 0
         category_lower = category.lower()
         
-        for std_category in self.STANDARD_CATEGORIES:
-            similarity = self._calculate_similarity(category_lower, std_category.lower())
-            if similarity > max_similarity:
-                max_similarity = similarity
-                closest = std_category
+        if process is not None:
+            match = process.extractOne(
+                category_lower,
+                self._std_categories_lower,
+                scorer=Levenshtein.normalized_similarity
+            )
+            if match is not None:
+                max_similarity = match[1]
+                closest = self._std_categories[match[2]]
+        else:
+            category_bigrams = _bigrams(category_lower)
+            for std_category, std_lower, std_bigrams in zip(
+                self._std_categories, self._std_categories_lower, self._std_bigrams
+            ):
+                # q-gram lemma: each edit destroys at most two bigrams of the
+                # longer string, so too few shared bigrams means the edit
+                # distance is too large to pass the threshold; skip the DP
+                longest = max(len(category_lower), len(std_lower))
+                shared = sum((category_bigrams & std_bigrams).values())
+                if shared <= longest - 1 - 2 * (1 - self.CATEGORY_MATCH_THRESHOLD) * longest:
+                    continue
+                similarity = self._calculate_similarity(
+                    category_lower, std_lower, self.CATEGORY_MATCH_THRESHOLD
+                )
+                if similarity > max_similarity:
+                    max_similarity = similarity
+                    closest = std_category
         
-        if closest and max_similarity > 0.8:  # Threshold for suggestion
+        if closest and max_similarity > self.CATEGORY_MATCH_THRESHOLD:
             self.logger.warning(f"Non-standard category '{category}' - using '{closest}' instead")
             return closest
         
         self.logger.warning(f"Using non-standard category: {category}")
         return category
     
-    def _calculate_similarity(self, s1: str, s2: str) -> float:
-        """Calculate string similarity for category matching."""
+    def _calculate_similarity(self, s1: str, s2: str, min_similarity: float = 0.0) -> float:
+        """Calculate string similarity for category matching.
+        
+        The pure-Python path returns 0.0 as soon as the similarity is known to
+        be at most min_similarity.
+        """
+        if Levenshtein is not None:
+            return Levenshtein.normalized_similarity(s1, s2)
+        
         # Simple Levenshtein distance-based similarity
         if len(s1) < len(s2):
-            return self._calculate_similarity(s2, s1)
+            s1, s2 = s2, s1
         
         if not s2:
             return 0
         
-        previous_row = range(len(s2) + 1)
+        if _levenshtein_kernel is not None:
+            distance = _levenshtein_kernel(_codepoints(s1), _codepoints(s2))
+            return 1 - (distance / len(s1))
+        
+        # One row updated in place: diag is the previous row's value at j,
+        # row[j + 1] still holds the previous row's value above the cell
+        max_distance = (1 - min_similarity) * len(s1)
+        row = array('i', range(len(s2) + 1))
         for i, c1 in enumerate(s1):
-            current_row = [i + 1]
+            diag = row[0]
+            left = row[0] = i + 1
+            row_min = left
             for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
+                up = row[j + 1]
+                left = min(up + 1, left + 1, diag + (c1 != c2))
+                diag = up
+                row[j + 1] = left
+                if left < row_min:
+                    row_min = left
+            
+            # Row minimums never decrease, so the distance is at least row_min
+            if row_min >= max_distance:
+                return 0.0
         
-        return 1 - (previous_row[-1] / max(len(s1), len(s2)))
+        return 1 - (row[-1] / len(s1))
     
     def add_templated_item(self,
-                          feed: ET.Element,
+                          feed: ET._Element,
                           template_name: str,
                           template_data: Dict[str, str],
                           link: str,
@@ -174,14 +406,14 @@ class EnhancedATFGenerator:
             raise ValueError(f"Missing required fields for template: {missing_fields}")
         
         # Format description and impact summary
-        description = template.description_template.format(**template_data)
-        impact_summary = template.impact_template.format(**template_data)
+        description = template._description_fn(template_data)
+        impact_summary = template._impact_fn(template_data)
         
         # Format metrics
         metrics = {}
-        for metric_name, metric_template in template.metrics.items():
+        for metric_name, metric_fn in template._metric_fns.items():
             try:
-                metrics[metric_name] = metric_template.format(**template_data)
+                metrics[metric_name] = metric_fn(template_data)
             except KeyError:
                 # Skip optional metrics that don't have data
                 continue
@@ -203,7 +435,7 @@ class EnhancedATFGenerator:
         )
     
     def batch_update(self,
-                    feed: ET.Element,
+                    feed: ET._Element,
                     updates: List[Dict],
                     template_name: Optional[str] = None) -> None:
         """Process multiple updates in batch."""
@@ -215,81 +447,89 @@ class EnhancedATFGenerator:
             else:
                 self.add_item(feed, **update)
     
-    def merge_feeds(self, feeds: List[ET.Element]) -> ET.Element:
-        """Merge multiple feeds into one, maintaining chronological order."""
+    def merge_feeds(self,
+                   feeds: List[ET._Element],
+                   preserve_sources: bool = False) -> ET._Element:
+        """Merge multiple feeds into one, maintaining chronological order.
+        
+        Items are moved out of the source feeds unless preserve_sources is set,
+        in which case they are copied and the sources are left intact.
+        """
         if not feeds:
             raise ValueError("No feeds to merge")
         
         # Create new feed with metadata from first feed
         first_feed = feeds[0]
-        first_channel = first_feed.find("channel")
+        first_channel = first_feed.find(self._tag("channel"))
         merged = self.create_feed(
-            title=first_channel.find("title").text,
-            link=first_channel.find("link").text,
-            description=first_channel.find("description").text,
-            language=first_channel.find("language").text
+            title=first_channel.find(self._tag("title")).text,
+            link=first_channel.find(self._tag("link")).text,
+            description=first_channel.find(self._tag("description")).text,
+            language=first_channel.find(self._tag("language")).text
         )
         
         # Collect all items
+        item_tag = self._tag("item")
         all_items = []
         for feed in feeds:
-            items = feed.findall("item")
-            all_items.extend(items)
+            all_items.extend(feed.iterchildren(item_tag))
         
-        # Sort items by publication date
-        all_items.sort(
-            key=lambda x: datetime.strptime(x.find("pubDate").text, "%Y-%m-%dT%H:%M:%SZ"),
-            reverse=True
-        )
+        # Sort items by publication date; the fixed-width ISO format sorts as text.
+        # Dates are read once up front rather than in the sort key.
+        pub_date_tag = self._tag("pubDate")
+        dates = [item.findtext(pub_date_tag) for item in all_items]
+        order = sorted(range(len(all_items)), key=dates.__getitem__, reverse=True)
+        all_items = [all_items[i] for i in order]
         
-        # Add items to merged feed
+        # Add items to merged feed; appending an element moves it from its source
+        if preserve_sources:
+            all_items = [copy.deepcopy(item) for item in all_items]
         for item in all_items:
-            merged.append(copy.deepcopy(item))
+            merged.append(item)
         
         return merged
     
     def manage_history(self, 
-                      feed: ET.Element,
+                      feed: ET._Element,
                       max_age_days: Optional[int] = None,
                       max_items: Optional[int] = None) -> None:
         """Manage historical entries in the feed."""
-        items = feed.findall("item")
+        items = feed.findall(self._tag("item"))
         if not items:
             return
+        pub_date_tag = self._tag("pubDate")
         
-        current_time = datetime.utcnow()
-        items_to_remove = set()
-        
-        # Identify items to remove based on age
-        if max_age_days is not None:
-            cutoff_date = current_time - timedelta(days=max_age_days)
-            for item in items:
-                pub_date = datetime.strptime(item.find("pubDate").text, "%Y-%m-%dT%H:%M:%SZ")
-                if pub_date < cutoff_date:
-                    items_to_remove.add(item)
+        # Read each pubDate once; the fixed-width ISO format compares as text
+        dates = [item.find(pub_date_tag).text for item in items]
+        keep = range(len(items))
         
-        # Identify items to remove based on count
+        # Keep only the newest items by count
         if max_items is not None and len(items) > max_items:
-            # Sort by date, newest first
-            sorted_items = sorted(
-                items,
-                key=lambda x: datetime.strptime(x.find("pubDate").text, "%Y-%m-%dT%H:%M:%SZ"),
-                reverse=True
-            )
-            items_to_remove.update(sorted_items[max_items:])
+            keep = heapq.nlargest(max_items, keep, key=dates.__getitem__)
+        
+        # Keep only items within the age limit
+        if max_age_days is not None:
+            cutoff_date = (datetime.utcnow() - timedelta(days=max_age_days)).strftime(_PUBDATE_FMT)
+            keep = [i for i in keep if dates[i] >= cutoff_date]
         
-        # Remove identified items
-        for item in items_to_remove:
-            feed.remove(item)
+        # Remove everything else in one pass
+        keep = set(keep)
+        for i, item in enumerate(items):
+            if i not in keep:
+                feed.remove(item)
     
-    def save_feed(self, feed: ET.Element, output_path: Path) -> None:
+    def save_feed(self, feed: ET._Element, output_path: Path) -> None:
         """Save the feed to a file with pretty printing."""
-        rough_string = ET.tostring(feed, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="  ")
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(pretty_xml)
+        ET.indent(feed, space="  ")
+        feed.getroottree().write(str(output_path), encoding="utf-8", xml_declaration=True)
+
+def load_json(path: Union[str, Path]):
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path) as f:
+        return json.load(f)
 
 def main():
     parser = argparse.ArgumentParser(description='Generate ATF XML feeds')
@@ -305,18 +545,19 @@ def main():
         generator = EnhancedATFGenerator()
         
         if args.merge:
-            # Merge multiple feeds
+            # Merge multiple feeds, reading them all with one parser. Their
+            # formatting is dropped as save_feed re-indents the result.
+            parser = ET.XMLParser(remove_blank_text=True, no_network=True)
             feeds = []
             for feed_path in args.merge:
-                tree = ET.parse(feed_path)
+                tree = ET.parse(feed_path, parser)
                 feeds.append(tree.getroot())
             merged_feed = generator.merge_feeds(feeds)
             generator.save_feed(merged_feed, Path(args.output))
             
         elif args.config:
             # Generate from config
-            with open(args.config) as f:
-                config = json.load(f)
+            config = load_json(args.config)
             
             feed = generator.create_feed(
                 title=config['title'],
@@ -2,25 +2,34 @@
 
 import json
 import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Union
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
-import git
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from lxml import etree as ET
 import logging
 from dataclasses import dataclass
+from contextlib import contextmanager
+from collections import OrderedDict
 import difflib
 import hashlib
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+# Slotted dataclasses need Python 3.10+; older versions keep __dict__ storage
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class FeedDiff:
     """Represents differences between two feed versions."""
     added_items: List[str]
     removed_items: List[str]
     modified_items: List[Dict]
     
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ImpactAssessment:
     """Template for impact assessments."""
     summary: str
@@ -32,6 +41,9 @@ class ImpactAssessment:
 class FeedManager:
     """Manages ATF feed archiving, versioning, and comparison."""
     
+    # Maximum number of cached feed ETags
+    ETAG_CACHE_SIZE = 1024
+    
     def __init__(self, workspace_dir: Union[str, Path]):
         """Initialize the feed manager."""
         self.workspace = Path(workspace_dir)
@@ -40,12 +52,33 @@ class FeedManager:
         self.archive_dir.mkdir(parents=True, exist_ok=True)
         self.git_dir.mkdir(parents=True, exist_ok=True)
         self.logger = logging.getLogger(__name__)
+        self._etag_cache: "OrderedDict[Path, Tuple[int, str]]" = OrderedDict()
         
-        # Initialize git repository if needed
-        if not (self.git_dir / ".git").exists():
-            self.repo = git.Repo.init(self.git_dir)
-        else:
-            self.repo = git.Repo(self.git_dir)
+        # The git repository is opened on first use, see the repo property
+        self._repo = None
+        
+        # Nesting depth of batch() and the feeds it has staged so far
+        self._batch_depth = 0
+        self._batch_paths: List[Path] = []
+        # Hexsha of the most recent batch() commit
+        self.last_batch_commit: Optional[str] = None
+    
+    @property
+    def repo(self):
+        """The workspace git repository, initialized on first use."""
+        if self._repo is None:
+            # GitPython is slow to import and only needed for version control
+            try:
+                import git
+            except ImportError as e:
+                raise RuntimeError("GitPython is required for feed version control") from e
+            
+            # Initialize git repository if needed
+            if not (self.git_dir / ".git").exists():
+                self._repo = git.Repo.init(self.git_dir)
+            else:
+                self._repo = git.Repo(self.git_dir)
+        return self._repo
     
     def archive_feed(self, feed_path: Union[str, Path], version: str) -> Path:
         """Archive a feed file with version information."""
@@ -67,14 +100,56 @@ class FeedManager:
         
         # Save metadata
         metadata_path = archive_path.with_suffix(".json")
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        if orjson is not None:
+            metadata_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+        else:
+            with open(metadata_path, "w") as f:
+                json.dump(metadata, f, indent=2)
             
         self.logger.info(f"Archived feed version {version} to {archive_path}")
         return archive_path
     
-    def version_control(self, feed_path: Union[str, Path], message: str) -> str:
-        """Add feed to version control with commit message."""
+    @contextmanager
+    def batch(self, message: str = "Batch update"):
+        """Group version_control calls into a single commit made on exit.
+        
+        The commit's hexsha is stored in last_batch_commit. If the batch
+        raises, nothing is committed and the feeds it staged are unstaged.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._discard_batch()
+            raise
+        
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and self._batch_paths:
+            self._batch_paths = []
+            commit = self.repo.index.commit(message)
+            self.last_batch_commit = commit.hexsha
+            self.logger.info(f"Committed feed batch to version control: {commit.hexsha}")
+    
+    def _discard_batch(self):
+        """Unstage the feeds staged by a failed batch."""
+        paths, self._batch_paths = self._batch_paths, []
+        if not paths:
+            return
+        if self.repo.head.is_valid():
+            self.repo.index.reset(paths=paths)
+        else:
+            # No commit to reset to yet, so drop the new entries instead
+            self.repo.index.remove(paths)
+        self.logger.info(f"Discarded {len(paths)} staged feed(s) from a failed batch")
+    
+    def version_control(self, feed_path: Union[str, Path], message: str) -> Optional[str]:
+        """Add feed to version control with commit message.
+        
+        Inside batch() the feed is only staged and None is returned; the
+        commit is made when the batch exits.
+        """
         feed_path = Path(feed_path)
         target_path = self.git_dir / feed_path.name
         
@@ -83,6 +158,9 @@ class FeedManager:
         
         # Add and commit
         self.repo.index.add([target_path])
+        if self._batch_depth:
+            self._batch_paths.append(target_path)
+            return None
         commit = self.repo.index.commit(message)
         
         self.logger.info(f"Committed feed to version control: {commit.hexsha}")
@@ -90,27 +168,28 @@ class FeedManager:
     
     def compare_feeds(self, feed1_path: Union[str, Path], feed2_path: Union[str, Path]) -> FeedDiff:
         """Compare two feed files and return differences."""
-        feed1 = ET.parse(feed1_path)
-        feed2 = ET.parse(feed2_path)
-        
-        items1 = self._extract_items(feed1)
-        items2 = self._extract_items(feed2)
+        items1 = self._extract_items(feed1_path)
+        items2 = self._extract_items(feed2_path)
         
         # Find differences
         added = []
         removed = []
         modified = []
         
-        for item_id, item in items2.items():
+        for item_id, (fingerprint, item) in items2.items():
             if item_id not in items1:
                 added.append(item["title"])
-            elif items1[item_id] != item:
+                continue
+            
+            # Unchanged items are settled by comparing fingerprints alone
+            old_fingerprint, old_item = items1[item_id]
+            if old_fingerprint != fingerprint:
                 modified.append({
                     "title": item["title"],
-                    "changes": self._diff_items(items1[item_id], item)
+                    "changes": self._diff_items(old_item, item)
                 })
         
-        for item_id, item in items1.items():
+        for item_id, (_, item) in items1.items():
             if item_id not in items2:
                 removed.append(item["title"])
         
@@ -202,25 +281,60 @@ class FeedManager:
         
         return updated_path
     
+    def get_feed_etag(self, feed_path: Union[str, Path]) -> str:
+        """Return a feed's ETag, cached until the file changes."""
+        feed_path = Path(feed_path).resolve()
+        mtime = feed_path.stat().st_mtime_ns
+        cached = self._etag_cache.get(feed_path)
+        if cached is not None and cached[0] == mtime:
+            self._etag_cache.move_to_end(feed_path)
+            return cached[1]
+        
+        etag = self._hash_file(feed_path, lambda: hashlib.blake2b(digest_size=16))
+        self._etag_cache[feed_path] = (mtime, etag)
+        self._etag_cache.move_to_end(feed_path)
+        if len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+            self._etag_cache.popitem(last=False)
+        return etag
+    
     def _calculate_checksum(self, file_path: Path) -> str:
         """Calculate SHA-256 checksum of a file."""
-        sha256 = hashlib.sha256()
+        return self._hash_file(file_path, hashlib.sha256)
+    
+    @staticmethod
+    def _hash_file(file_path: Path, new_hash: Callable) -> str:
+        """Hash a file's content without reading it into memory at once."""
         with open(file_path, "rb") as f:
-            for block in iter(lambda: f.read(4096), b""):
-                sha256.update(block)
-        return sha256.hexdigest()
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, new_hash).hexdigest()
+            
+            # Python < 3.11: large reads keep the Python-level loop short
+            digest = new_hash()
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+            return digest.hexdigest()
+    
+    def _extract_items(self, feed_path: Union[str, Path]) -> Dict[str, Tuple[bytes, Dict]]:
+        """Extract items from feed with their IDs, as (fingerprint, fields) pairs."""
+        return dict(self._iter_items(feed_path))
     
-    def _extract_items(self, tree: ET.ElementTree) -> Dict:
-        """Extract items from feed with their IDs."""
-        items = {}
-        for item in tree.findall(".//item"):
-            item_id = item.find("link").text
-            items[item_id] = {
-                "title": item.find("title").text,
-                "description": item.find("description").text,
-                "pubDate": item.find("pubDate").text
+    def _iter_items(self, feed_path: Union[str, Path]):
+        """Stream (link, (fingerprint, fields)) pairs from a feed without keeping its tree."""
+        for _, item in ET.iterparse(str(feed_path), events=("end",), tag="{*}item"):
+            fields = {
+                "title": item.findtext("{*}title"),
+                "description": item.findtext("{*}description"),
+                "pubDate": item.findtext("{*}pubDate")
             }
-        return items
+            fingerprint = hashlib.blake2b(
+                repr(tuple(fields.values())).encode(), digest_size=16
+            ).digest()
+            yield item.findtext("{*}link"), (fingerprint, fields)
+            
+            # Release the item and anything parsed before it
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
     
     def _diff_items(self, item1: Dict, item2: Dict) -> Dict:
         """Generate detailed diff between two items."""
@@ -230,19 +344,18 @@ class FeedManager:
                 diffs[key] = {
                     "old": item1[key],
                     "new": item2[key],
-                    "diff": list(difflib.ndiff(
+                    "diff": list(difflib.unified_diff(
                         item1[key].splitlines(),
-                        item2[key].splitlines()
+                        item2[key].splitlines(),
+                        lineterm=""
                     ))
                 }
         return diffs
     
-    def _save_xml(self, tree: ET.ElementTree, path: Path):
+    def _save_xml(self, tree: ET._ElementTree, path: Path):
         """Save XML tree with pretty printing."""
-        rough_string = ET.tostring(tree.getroot(), encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(reparsed.toprettyxml(indent="  "))
+        ET.indent(tree, space="  ")
+        tree.write(str(path), xml_declaration=True, encoding="utf-8")
 
 def main():
     import argparse
@@ -284,8 +397,12 @@ def main():
             for field, changes in item['changes'].items():
                 print(f"    {field}: {changes['old']} -> {changes['new']}")
     elif args.command == "update":
-        with open(args.updates) as f:
-            updates = json.load(f)
+        if orjson is not None:
+            with open(args.updates, "rb") as f:
+                updates = orjson.loads(f.read())
+        else:
+            with open(args.updates) as f:
+                updates = json.load(f)
         manager.automate_update(args.feed, updates, args.version)
 
 if __name__ == "__main__":
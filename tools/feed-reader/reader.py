@@ -4,71 +4,88 @@ import argparse
 import sys
 from pathlib import Path
 from typing import Dict, List
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 from datetime import datetime
 import json
 
+ATF_NAMESPACE = "https://www.algorithmictransparency.gov/atf"
+
+# Child lookups compiled once; find() re-resolves prefixed paths on every call
+_CHILD_PATHS = {
+    name: ET.XPath(f"atf:{name}", namespaces={"atf": ATF_NAMESPACE})
+    for name in ("title", "link", "description", "lastBuildDate", "language",
+                 "pubDate", "impactAssessment", "summary", "affectedUsers")
+}
+_CATEGORIES_PATH = ET.XPath("atf:categories/atf:category", namespaces={"atf": ATF_NAMESPACE})
+_METRICS_PATH = ET.XPath("atf:metrics/atf:metric", namespaces={"atf": ATF_NAMESPACE})
+
 class ATFReader:
     """Reader for Algorithmic Transparency Feed (ATF) files."""
     
     def __init__(self):
         """Initialize the ATF reader."""
-        self.namespace = {"atf": "https://www.algorithmictransparency.gov/atf"}
+        self.namespace = {"atf": ATF_NAMESPACE}
     
     def read_feed(self, file_path: Path) -> Dict:
         """Read and parse an ATF feed file."""
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        
-        # Parse channel information
-        channel = root.find("atf:channel", self.namespace)
-        feed_info = {
-            "title": self._get_text(channel, "atf:title"),
-            "link": self._get_text(channel, "atf:link"),
-            "description": self._get_text(channel, "atf:description"),
-            "lastBuildDate": self._get_text(channel, "atf:lastBuildDate"),
-            "language": self._get_text(channel, "atf:language"),
-            "items": []
-        }
+        ns = self.namespace["atf"]
+        channel_tag = f"{{{ns}}}channel"
+        feed_info = {"items": []}
         
-        # Parse items
-        for item in root.findall("atf:item", self.namespace):
-            feed_info["items"].append(self._parse_item(item))
+        # Stream the document, discarding each element once it is handled
+        for _, elem in ET.iterparse(str(file_path), events=("end",),
+                                    tag=(channel_tag, f"{{{ns}}}item")):
+            if elem.tag == channel_tag:
+                # Parse channel information
+                feed_info.update({
+                    "title": self._get_text(elem, "title"),
+                    "link": self._get_text(elem, "link"),
+                    "description": self._get_text(elem, "description"),
+                    "lastBuildDate": self._get_text(elem, "lastBuildDate"),
+                    "language": self._get_text(elem, "language"),
+                })
+            else:
+                # Parse items
+                feed_info["items"].append(self._parse_item(elem))
+            
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
         
+        # Keep the channel fields ahead of the items in the output
+        feed_info["items"] = feed_info.pop("items")
         return feed_info
     
-    def _get_text(self, element: ET.Element, xpath: str) -> str:
-        """Get text content from an element using xpath."""
-        elem = element.find(xpath, self.namespace)
-        return elem.text if elem is not None else ""
+    def _get_text(self, element: ET.Element, name: str) -> str:
+        """Get the text content of an element's first ATF child with this name."""
+        found = _CHILD_PATHS[name](element)
+        return found[0].text if found else ""
     
     def _parse_item(self, item: ET.Element) -> Dict:
         """Parse an individual feed item."""
         # Parse categories
-        categories = []
-        cats_elem = item.find("atf:categories", self.namespace)
-        if cats_elem is not None:
-            categories = [cat.text for cat in cats_elem.findall("atf:category", self.namespace)]
+        categories = [cat.text for cat in _CATEGORIES_PATH(item)]
         
         # Parse impact assessment
-        impact = item.find("atf:impactAssessment", self.namespace)
+        impacts = _CHILD_PATHS["impactAssessment"](item)
+        if not impacts:
+            raise ValueError("Feed item has no impactAssessment element")
+        impact = impacts[0]
         impact_data = {
-            "summary": self._get_text(impact, "atf:summary"),
-            "affectedUsers": self._get_text(impact, "atf:affectedUsers"),
+            "summary": self._get_text(impact, "summary"),
+            "affectedUsers": self._get_text(impact, "affectedUsers"),
             "metrics": {}
         }
         
         # Parse metrics
-        metrics_elem = impact.find("atf:metrics", self.namespace)
-        if metrics_elem is not None:
-            for metric in metrics_elem.findall("atf:metric", self.namespace):
-                impact_data["metrics"][metric.get("name")] = metric.text
+        for metric in _METRICS_PATH(impact):
+            impact_data["metrics"][metric.get("name")] = metric.text
         
         return {
-            "title": self._get_text(item, "atf:title"),
-            "link": self._get_text(item, "atf:link"),
-            "pubDate": self._get_text(item, "atf:pubDate"),
-            "description": self._get_text(item, "atf:description"),
+            "title": self._get_text(item, "title"),
+            "link": self._get_text(item, "link"),
+            "pubDate": self._get_text(item, "pubDate"),
+            "description": self._get_text(item, "description"),
             "categories": categories,
             "impactAssessment": impact_data
         }
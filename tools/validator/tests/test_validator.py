@@ -1,8 +1,14 @@
+import copy
+import dataclasses
+import importlib.util
+import io
+import pickle
+import sys
 import pytest
 from pathlib import Path
 from datetime import datetime, timedelta
 from lxml import etree
-from validator import ATFValidator, ValidationError
+from validator import ATFValidator, ValidationError, main
 
 # Fixtures for test setup
 @pytest.fixture
@@ -52,154 +58,149 @@ def base_item_template():
 
 # Date Format Tests
 class TestDateValidation:
-    def test_valid_date_formats(self, tmp_path, validator, base_xml_template):
+    @pytest.mark.parametrize("date", [
+        datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        (datetime.utcnow() - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        (datetime.utcnow() - timedelta(days=365)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    ])
+    def test_valid_date_formats(self, validator, base_xml_template, date):
         """Test various valid date formats."""
-        current_time = datetime.utcnow()
-        dates = [
-            current_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-            (current_time - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
-            (current_time - timedelta(days=365)).strftime("%Y-%m-%dT%H:%M:%SZ")
-        ]
-        
-        for date in dates:
-            xml = base_xml_template.format(
-                lastBuildDate=date,
-                language="en-us",
-                items=""
-            )
-            xml_file = tmp_path / "test.xml"
-            xml_file.write_text(xml)
-            errors = validator.validate_file(xml_file)
-            assert not errors, f"Valid date {date} should not produce errors"
+        xml = base_xml_template.format(
+            lastBuildDate=date,
+            language="en-us",
+            items=""
+        )
+        errors = validator.validate_bytes(xml.encode())
+        assert not errors, f"Valid date {date} should not produce errors"
 
-    def test_invalid_date_formats(self, tmp_path, validator, base_xml_template):
+    @pytest.mark.parametrize("date", [
+        "2025-01-19",  # Missing time
+        "2025-01-19T12:00",  # Missing seconds
+        "2025-01-19 12:00:00",  # Wrong separator
+        "2025-13-19T12:00:00Z",  # Invalid month
+        "2025-01-32T12:00:00Z",  # Invalid day
+        "2025-01-19T25:00:00Z",  # Invalid hour
+        datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S"),  # Missing Z
+        (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ")  # Future date
+    ])
+    def test_invalid_date_formats(self, validator, base_xml_template, date):
         """Test various invalid date formats."""
-        invalid_dates = [
-            "2025-01-19",  # Missing time
-            "2025-01-19T12:00",  # Missing seconds
-            "2025-01-19 12:00:00",  # Wrong separator
-            "2025-13-19T12:00:00Z",  # Invalid month
-            "2025-01-32T12:00:00Z",  # Invalid day
-            "2025-01-19T25:00:00Z",  # Invalid hour
-            datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S"),  # Missing Z
-            (datetime.utcnow() + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ")  # Future date
-        ]
-        
-        for date in invalid_dates:
-            xml = base_xml_template.format(
-                lastBuildDate=date,
-                language="en-us",
-                items=""
-            )
-            xml_file = tmp_path / "test.xml"
-            xml_file.write_text(xml)
-            errors = validator.validate_file(xml_file)
-            assert errors, f"Invalid date {date} should produce errors"
+        xml = base_xml_template.format(
+            lastBuildDate=date,
+            language="en-us",
+            items=""
+        )
+        errors = validator.validate_bytes(xml.encode())
+        assert errors, f"Invalid date {date} should produce errors"
+
+    def test_pub_date_after_last_build_date(self, validator, base_xml_template, base_item_template):
+        """Items published after the feed's lastBuildDate should be reported."""
+        now = datetime.utcnow()
+        pub_date = (now - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        item = base_item_template.format(
+            pubDate=pub_date,
+            category="Security",
+            affectedUsers="10%",
+            metrics=""
+        )
+        xml = base_xml_template.format(
+            lastBuildDate=(now - timedelta(days=2)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            language="en-us",
+            items=item
+        )
+        errors = validator.validate_bytes(xml.encode())
+        assert f"pubDate is after lastBuildDate: {pub_date}" in errors
 
 # Language Code Tests
 class TestLanguageValidation:
-    def test_valid_language_codes(self, tmp_path, validator, base_xml_template):
+    @pytest.mark.parametrize("lang", sorted(ATFValidator.ALLOWED_LANGUAGES))
+    def test_valid_language_codes(self, validator, base_xml_template, lang):
         """Test all supported language codes."""
-        for lang in validator.ALLOWED_LANGUAGES:
-            xml = base_xml_template.format(
-                lastBuildDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                language=lang,
-                items=""
-            )
-            xml_file = tmp_path / "test.xml"
-            xml_file.write_text(xml)
-            errors = validator.validate_file(xml_file)
-            assert not errors, f"Valid language code {lang} should not produce errors"
+        xml = base_xml_template.format(
+            lastBuildDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            language=lang,
+            items=""
+        )
+        errors = validator.validate_bytes(xml.encode())
+        assert not errors, f"Valid language code {lang} should not produce errors"
 
-    def test_invalid_language_codes(self, tmp_path, validator, base_xml_template):
+    @pytest.mark.parametrize("lang", [
+        "eng",  # Wrong format
+        "en_US",  # Wrong separator
+        "en-USA",  # Wrong region format
+        "xx-xx",  # Non-existent code
+        "",  # Empty
+        "12345"  # Invalid format
+    ])
+    def test_invalid_language_codes(self, validator, base_xml_template, lang):
         """Test various invalid language codes."""
-        invalid_langs = [
-            "eng",  # Wrong format
-            "en_US",  # Wrong separator
-            "en-USA",  # Wrong region format
-            "xx-xx",  # Non-existent code
-            "",  # Empty
-            "12345"  # Invalid format
-        ]
-        
-        for lang in invalid_langs:
-            xml = base_xml_template.format(
-                lastBuildDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                language=lang,
-                items=""
-            )
-            xml_file = tmp_path / "test.xml"
-            xml_file.write_text(xml)
-            errors = validator.validate_file(xml_file)
-            assert errors, f"Invalid language code {lang} should produce errors"
+        xml = base_xml_template.format(
+            lastBuildDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            language=lang,
+            items=""
+        )
+        errors = validator.validate_bytes(xml.encode())
+        assert errors, f"Invalid language code {lang} should produce errors"
+
+    def test_language_codes_case_insensitive(self, validator, base_xml_template):
+        """Language codes should be accepted regardless of case."""
+        xml = base_xml_template.format(
+            lastBuildDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            language="EN-US",
+            items=""
+        )
+        errors = validator.validate_bytes(xml.encode())
+        assert not errors, "Upper-case language code EN-US should not produce errors"
 
 # Metric Format Tests
 class TestMetricValidation:
     @pytest.fixture
-    def metric_template(self):
-        return '<metric name="{name}">{value}</metric>'
-
-    def test_valid_metric_formats(self, tmp_path, validator, base_xml_template, base_item_template, metric_template):
-        """Test various valid metric formats."""
-        valid_metrics = [
-            ("Percentage", "+10.5%"),
-            ("Ratio", "3:1"),
-            ("Duration", "200ms"),
-            ("Duration", "1.5s"),
-            ("Duration", "30min"),
-            ("Boolean", "true"),
-            ("Numeric", "-15.7"),
-            ("Numeric", "+42")
-        ]
-        
-        for name, value in valid_metrics:
-            metric = metric_template.format(name=name, value=value)
+    def metric_xml(self, base_xml_template, base_item_template):
+        """Build a single-item feed containing one metric."""
+        def build(name, value):
+            metric = f'<metric name="{name}">{value}</metric>'
             item = base_item_template.format(
                 pubDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
                 category="Test",
                 affectedUsers="10%",
                 metrics=metric
             )
-            xml = base_xml_template.format(
+            return base_xml_template.format(
                 lastBuildDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
                 language="en-us",
                 items=item
             )
-            xml_file = tmp_path / "test.xml"
-            xml_file.write_text(xml)
-            errors = validator.validate_file(xml_file)
-            assert not errors, f"Valid metric {name}={value} should not produce errors"
+        return build
+
+    @pytest.mark.parametrize("name,value", [
+        ("Percentage", "+10.5%"),
+        ("Ratio", "3:1"),
+        ("Duration", "200ms"),
+        ("Duration", "1.5s"),
+        ("Duration", "30min"),
+        ("Boolean", "true"),
+        ("Numeric", "-15.7"),
+        ("Numeric", "+42")
+    ])
+    def test_valid_metric_formats(self, validator, metric_xml, name, value):
+        """Test various valid metric formats."""
+        errors = validator.validate_bytes(metric_xml(name, value).encode())
+        assert not errors, f"Valid metric {name}={value} should not produce errors"
 
-    def test_invalid_metric_formats(self, tmp_path, validator, base_xml_template, base_item_template, metric_template):
+    @pytest.mark.parametrize("name,value", [
+        ("Percentage", "10.5"),  # Missing %
+        ("Percentage", "10.5%%"),  # Double %
+        ("Ratio", "3:"),  # Incomplete ratio
+        ("Duration", "200"),  # Missing unit
+        ("Duration", "1.5x"),  # Invalid unit
+        ("Boolean", "yes"),  # Invalid boolean
+        ("Numeric", "15.7.2"),  # Invalid number
+        ("Numeric", "++42")  # Invalid format
+    ])
+    def test_invalid_metric_formats(self, validator, metric_xml, name, value):
         """Test various invalid metric formats."""
-        invalid_metrics = [
-            ("Percentage", "10.5"),  # Missing %
-            ("Percentage", "10.5%%"),  # Double %
-            ("Ratio", "3:"),  # Incomplete ratio
-            ("Duration", "200"),  # Missing unit
-            ("Duration", "1.5x"),  # Invalid unit
-            ("Boolean", "yes"),  # Invalid boolean
-            ("Numeric", "15.7.2"),  # Invalid number
-            ("Numeric", "++42")  # Invalid format
-        ]
-        
-        for name, value in invalid_metrics:
-            metric = metric_template.format(name=name, value=value)
-            item = base_item_template.format(
-                pubDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                category="Test",
-                affectedUsers="10%",
-                metrics=metric
-            )
-            xml = base_xml_template.format(
-                lastBuildDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-                language="en-us",
-                items=item
-            )
-            xml_file = tmp_path / "test.xml"
-            xml_file.write_text(xml)
-            errors = validator.validate_file(xml_file)
-            assert errors, f"Invalid metric {name}={value} should produce errors"
+        errors = validator.validate_bytes(metric_xml(name, value).encode())
+        assert errors, f"Invalid metric {name}={value} should produce errors"
 
 # Large File Tests
 class TestFileSizeValidation:
@@ -296,4 +297,146 @@ class TestMalformedXML:
         xml_file = tmp_path / "invalid_ns.xml"
         xml_file.write_text(invalid_ns_xml)
         errors = validator.validate_file(xml_file)
-        assert errors, "XML with invalid namespace should produce errors"
\ No newline at end of file
+        assert errors, "XML with invalid namespace should produce errors"
+        assert any("ATF namespace" in error for error in errors)
+
+    def test_empty_values(self, validator, base_xml_template, base_item_template):
+        """Empty elements should be reported individually, not abort validation."""
+        item = base_item_template.format(
+            pubDate="",
+            category="Security",
+            affectedUsers="",
+            metrics='<metric name="test"></metric>'
+        )
+        xml = base_xml_template.format(
+            lastBuildDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            language="",
+            items=item
+        )
+        errors = validator.validate_bytes(xml.encode())
+        for field in ("pubDate", "affectedUsers", "metric test", "language"):
+            assert f"Missing value for {field}" in errors
+        assert not any(error.startswith("Failed to parse") for error in errors)
+
+# In-memory Content Tests
+class TestBytesValidation:
+    def test_bytes_match_file_validation(self, tmp_path, validator, base_xml_template):
+        """Validating bytes should report the same errors as validating a file."""
+        xml = base_xml_template.format(
+            lastBuildDate=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            language="xx-xx",
+            items=""
+        )
+        xml_file = tmp_path / "test.xml"
+        xml_file.write_text(xml)
+        assert validator.validate_bytes(xml.encode()) == validator.validate_file(xml_file)
+
+    def test_malformed_bytes(self, validator):
+        """Malformed in-memory content should produce errors."""
+        errors = validator.validate_bytes(b'<atf><channel>')
+        assert errors, "Malformed content should produce errors"
+
+    def test_validate_files(self, tmp_path, validator):
+        """Batch validation should report errors per file."""
+        paths = [tmp_path / "first.xml", tmp_path / "second.xml"]
+        for path in paths:
+            path.write_text('<atf><channel>')
+        results = validator.validate_files(paths)
+        assert list(results) == [str(path) for path in paths]
+        assert all(results.values()), "Each malformed file should produce errors"
+
+    def test_fail_fast_reports_schema_errors_only(self, test_files_dir):
+        """With fail_fast, schema-invalid content skips the enhanced checks."""
+        content = b'''<atf xmlns="https://www.algorithmictransparency.gov/atf" version="1.0">
+  <channel><language>xx</language></channel>
+</atf>'''
+        schema_path = test_files_dir / 'test_schema.xsd'
+        assert any("Unsupported language code" in error
+                   for error in ATFValidator(schema_path).validate_bytes(content))
+        errors = ATFValidator(schema_path, fail_fast=True).validate_bytes(content)
+        assert errors
+        assert not any("Unsupported language code" in error for error in errors)
+
+    def test_max_errors_limits_report(self, test_files_dir):
+        """Validation should stop once max_errors errors have been found."""
+        content = b'''<atf xmlns="https://www.algorithmictransparency.gov/atf" version="1.0">
+  <channel><language>xx</language></channel>
+</atf>'''
+        schema_path = test_files_dir / 'test_schema.xsd'
+        assert len(ATFValidator(schema_path).validate_bytes(content)) > 1
+        errors = ATFValidator(schema_path, max_errors=1).validate_bytes(content)
+        assert len(errors) == 1
+
+    @pytest.mark.parametrize("max_errors", [0, -1])
+    def test_max_errors_must_be_positive(self, test_files_dir, max_errors):
+        """A limit below 1 would hide every error, so it is rejected."""
+        with pytest.raises(ValueError):
+            ATFValidator(test_files_dir / 'test_schema.xsd', max_errors=max_errors)
+
+    def test_empty_stdin_is_an_error(self, monkeypatch):
+        """Reading paths from empty stdin fails instead of passing silently."""
+        monkeypatch.setattr(sys, 'argv', ['validator.py', '-'])
+        monkeypatch.setattr(sys, 'stdin', io.StringIO("\n"))
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 2
+
+# Schema Loading Tests
+class TestSchemaCache:
+    def test_schema_shared_between_validators(self, test_files_dir):
+        """Validators for the same unchanged schema file should share it."""
+        schema_path = test_files_dir / 'test_schema.xsd'
+        assert ATFValidator(schema_path).schema is ATFValidator(schema_path).schema
+
+# Generated Feed Tests
+@pytest.fixture
+def generator_module(monkeypatch):
+    """Generator module from tools/feed-generator."""
+    path = Path(__file__).parents[2] / 'feed-generator' / 'generator.py'
+    spec = importlib.util.spec_from_file_location('generator', path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so pickle can find its classes by module name
+    monkeypatch.setitem(sys.modules, 'generator', module)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def generator(generator_module):
+    """Feed generator from tools/feed-generator."""
+    return generator_module.EnhancedATFGenerator()
+
+class TestGeneratedFeeds:
+    def test_generated_feed_is_valid(self, validator, generator):
+        """Items added after a feed was created should not predate its lastBuildDate."""
+        feed = generator.create_feed("Test Feed", "https://example.com/feed", "Test Description")
+        # Simulate a feed created a minute before its newest item is added
+        last_build = feed.find(f"{{{generator.namespace}}}channel/{{{generator.namespace}}}lastBuildDate")
+        last_build.text = (datetime.utcnow() - timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for pub_date in (datetime.utcnow() - timedelta(days=400), None):
+            generator.add_item(
+                feed,
+                title="Test Item",
+                link="https://example.com/item1",
+                description="Test description",
+                categories=["Security"],
+                impact_summary="Test impact",
+                affected_users="10%",
+                metrics={"accuracy": "95%"},
+                pub_date=pub_date
+            )
+        errors = validator.validate_bytes(etree.tostring(feed))
+        assert not errors, errors
+
+    def test_templates_are_value_objects(self, generator_module, generator):
+        """Templates can be copied, pickled and hashed."""
+        template = generator_module.UpdateTemplate(
+            'n', ('a',), 'd {x}', 'i {x}', {'m': '{x}'}, {'x'}
+        )
+        for t in (template, generator.get_template('ranking_update')):
+            assert copy.deepcopy(t) == t
+            restored = pickle.loads(pickle.dumps(t))
+            assert restored == t
+            assert hash(restored) == hash(t)
+            assert dataclasses.asdict(t)['metrics'] == t.metrics
+        assert template.metric_templates == {'m': '{x}'}
+        assert pickle.loads(pickle.dumps(template))._metric_fns['m']({'x': '1'}) == '1'
@@ -1,25 +1,70 @@
 #!/usr/bin/env python3
 
+import io
+import os
 import sys
 import re
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Union, List, Dict, Set
+from typing import Iterable, Iterator, Optional, Union, List, Dict, Tuple
 from lxml import etree
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 import urllib.parse
 
 class ValidationError(Exception):
     """Custom exception for validation errors."""
     pass
 
+# Namespace every ATF element is declared in
+ATF_NAMESPACE = "https://www.algorithmictransparency.gov/atf"
+
+# Elements inspected by the enhanced checks, matched in the ATF namespace only
+CHECKED_ELEMENTS = (
+    'lastBuildDate', 'pubDate', 'link', 'affectedUsers', 'metric', 'category', 'language'
+)
+_CHECKED_TAGS = {f"{{{ATF_NAMESPACE}}}{name}": name for name in CHECKED_ELEMENTS}
+
+# Checked elements of a document grouped by local name, in document order
+Elements = Dict[str, List[etree._Element]]
+
+# Accepted metric value formats, tried in order
+METRIC_PATTERNS = (
+    ('percentage', re.compile(r'^[+-]?\d+(\.\d+)?%$')),
+    ('numeric', re.compile(r'^[+-]?\d+(\.\d+)?$')),
+    ('ratio', re.compile(r'^\d+:\d+$')),
+    ('duration', re.compile(r'^\d+(\.\d+)?(ms|s|min|h)$')),
+    ('boolean', re.compile(r'^(true|false)$', re.I))
+)
+
+@lru_cache(maxsize=8)
+def _compile_schema(path: str, mtime_ns: int) -> etree.XMLSchema:
+    """Compile an XSD schema, shared by all validators using it.
+    
+    Keyed by resolved path and mtime so an edited schema is recompiled.
+    """
+    return etree.XMLSchema(etree.parse(path))
+
+@lru_cache(maxsize=4096)
+def _metric_format_type(value: str) -> str:
+    """Determine the format type of a metric value, or 'unknown'.
+    
+    Cached because metric values are short and repeat heavily across items.
+    """
+    for format_type, pattern in METRIC_PATTERNS:
+        if pattern.match(value):
+            return format_type
+    return 'unknown'
+
 class ATFValidator:
     """Enhanced validator for Algorithmic Transparency Feed (ATF) files."""
     
     # Constants for validation
     MAX_FEED_SIZE = 10 * 1024 * 1024  # 10MB
     MIN_RETENTION_DAYS = 365  # 1 year
-    ALLOWED_LANGUAGES = {'en-us', 'en-gb', 'es', 'fr', 'de', 'zh'}  # Example set
+    ALLOWED_LANGUAGES = frozenset({'en-us', 'en-gb', 'es', 'fr', 'de', 'zh'})  # Example set, lowercase
     STANDARD_CATEGORIES = {
         'Ranking Algorithm',
         'Content Moderation',
@@ -33,151 +78,259 @@ class ATFValidator:
         'Performance'
     }
     
-    def __init__(self, schema_path: Union[str, Path]):
-        """Initialize validator with schema path."""
+    # Parser hardening: no entity expansion, network access or huge documents.
+    # Indentation, comments and PIs are dropped; no check looks at them.
+    PARSER_OPTIONS = dict(
+        resolve_entities=False, no_network=True, huge_tree=False, collect_ids=False,
+        remove_blank_text=True, remove_comments=True, remove_pis=True
+    )
+    
+    # Compiled once; the checks below run them for every element
+    PERCENTAGE_PATTERN = re.compile(r'^\d+(\.\d+)?%$')
+    CATEGORY_NAME_PATTERN = re.compile(r'^[A-Z][a-zA-Z0-9 ]+$')
+    # Well-formed http(s) URIs with a dotted host; anything else gets the detailed checks
+    URI_FAST_PATTERN = re.compile(r'https?://[^\s/?#\[\]]*\.[^\s/?#\[\]]*(?:[/?#]\S*)?')
+    
+    def __init__(self, schema_path: Union[str, Path], fail_fast: bool = False,
+                 max_errors: Optional[int] = None):
+        """Initialize validator with schema path.
+        
+        With fail_fast, documents the schema rejects are not given the
+        enhanced checks, so only the schema errors are reported for them.
+        With max_errors, validation of a document stops once that many
+        errors have been found.
+        """
+        if max_errors is not None and max_errors < 1:
+            raise ValueError(f"max_errors must be at least 1, got {max_errors}")
         self.schema_path = Path(schema_path)
+        self.fail_fast = fail_fast
+        self.max_errors = max_errors
         self._load_schema()
+        # One parser per validator so libxml2 can reuse its parser context.
+        # The schema is not attached: that would stop at the first error.
+        self._parser = etree.XMLParser(**self.PARSER_OPTIONS)
         
     def _load_schema(self):
-        """Load and parse the XSD schema."""
+        """Load and parse the XSD schema, reusing it while the file is unchanged."""
         try:
-            with open(self.schema_path) as schema_file:
-                schema_doc = etree.parse(schema_file)
-                self.schema = etree.XMLSchema(schema_doc)
+            self.schema = _compile_schema(
+                str(self.schema_path.resolve()), self.schema_path.stat().st_mtime_ns
+            )
         except Exception as e:
             raise ValueError(f"Failed to load schema: {e}")
 
     def validate_file(self, xml_path: Union[str, Path]) -> List[str]:
         """Validate an ATF XML file with enhanced checks."""
-        errors = []
+        return list(self.iter_file_errors(xml_path))
+
+    def iter_file_errors(self, xml_path: Union[str, Path]) -> Iterator[str]:
+        """Yield the errors of an ATF XML file as each check finds them."""
         try:
-            xml_path = Path(xml_path)
+            with open(xml_path, 'rb') as xml_file:
+                # Check the size of the file actually being parsed
+                if os.fstat(xml_file.fileno()).st_size > self.MAX_FEED_SIZE:
+                    yield f"Feed file exceeds maximum size of {self.MAX_FEED_SIZE/1024/1024}MB"
+                    return
+                
+                doc, elements = self._parse(xml_file)
             
-            # Check file size
-            if xml_path.stat().st_size > self.MAX_FEED_SIZE:
-                errors.append(f"Feed file exceeds maximum size of {self.MAX_FEED_SIZE/1024/1024}MB")
+            yield from self._validate_document(doc, elements)
+                
+        except Exception as e:
+            yield f"Failed to parse XML file: {e}"
+
+    def validate_files(self, xml_paths: Iterable[Union[str, Path]]) -> Dict[str, List[str]]:
+        """Validate several ATF XML files, returning the errors for each path."""
+        return {str(xml_path): self.validate_file(xml_path) for xml_path in xml_paths}
+
+    def validate_bytes(self, content: bytes) -> List[str]:
+        """Validate ATF XML content already held in memory."""
+        errors = []
+        try:
+            if len(content) > self.MAX_FEED_SIZE:
+                errors.append(f"Feed content exceeds maximum size of {self.MAX_FEED_SIZE/1024/1024}MB")
                 return errors
             
-            with open(xml_path) as xml_file:
-                doc = etree.parse(xml_file)
-                
-                # Basic schema validation
-                try:
-                    self.schema.assertValid(doc)
-                except etree.DocumentInvalid as e:
-                    errors.extend(str(error) for error in e.error_log)
-                
-                # Enhanced validations
-                errors.extend(self._validate_dates(doc))
-                errors.extend(self._validate_uris(doc))
-                errors.extend(self._validate_percentages(doc))
-                errors.extend(self._validate_metrics(doc))
-                errors.extend(self._validate_categories(doc))
-                errors.extend(self._validate_language(doc))
-                errors.extend(self._validate_retention(doc))
-                
+            errors.extend(self._validate_document(*self._parse(io.BytesIO(content))))
+        
         except Exception as e:
-            errors.append(f"Failed to parse XML file: {e}")
+            errors.append(f"Failed to parse XML content: {e}")
         
         return errors
 
-    def _validate_percentages(self, doc: etree._ElementTree) -> List[str]:
-        """Validate percentage format in affected users and metrics."""
+    def _parse(self, source) -> Tuple[etree._ElementTree, Elements]:
+        """Parse a document and collect the checked elements in document order.
+        
+        The tree is kept in full because XSD validation needs it. A parser
+        with the schema attached validates while parsing, but it stops at the
+        first error, reports line 0, and measured no faster than parsing and
+        then validating.
+        """
+        doc = etree.parse(source, self._parser)
+        elements: Elements = {name: [] for name in CHECKED_ELEMENTS}
+        for elem in doc.iter(*_CHECKED_TAGS):
+            elements[_CHECKED_TAGS[elem.tag]].append(elem)
+        return doc, elements
+
+    def _validate_document(self, doc: etree._ElementTree, elements: Elements) -> Iterator[str]:
+        """Run schema and enhanced validations on a parsed document.
+        
+        Errors are produced lazily, one check at a time, and stop after
+        max_errors, so the remaining checks are skipped once enough is known.
+        """
+        return islice(self._document_errors(doc, elements), self.max_errors)
+
+    def _document_errors(self, doc: etree._ElementTree, elements: Elements) -> Iterator[str]:
+        """Generate the schema errors, then the errors of each enhanced check."""
+        # Basic schema validation. The schema's error_log holds the errors of
+        # its most recent validation, so a validator (and the schema it shares
+        # with others) must not validate from several threads at once; the
+        # log is copied before yielding for the same reason.
+        if not self.schema.validate(doc):
+            schema_errors = [str(error) for error in self.schema.error_log]
+            yield from schema_errors
+            if self.fail_fast:
+                return
+        
+        # Elements outside the ATF namespace are invisible to the enhanced
+        # checks, so say so rather than let them pass silently
+        namespace = etree.QName(doc.getroot()).namespace
+        if namespace != ATF_NAMESPACE:
+            yield (
+                f"Root element must be in the ATF namespace {ATF_NAMESPACE}, "
+                f"found {namespace or 'no namespace'}"
+            )
+        
+        # Enhanced validations; pubDates are parsed once and reused for retention
+        date_errors, pub_dates = self._validate_dates(elements)
+        yield from date_errors
+        yield from self._validate_uris(elements)
+        # Metrics are read once for both their percentage and format checks
+        metric_percentage_errors, metric_errors = self._validate_metrics(elements)
+        yield from self._validate_percentages(elements)
+        yield from metric_percentage_errors
+        yield from metric_errors
+        yield from self._validate_categories(elements)
+        yield from self._validate_language(elements)
+        yield from self._validate_retention(pub_dates)
+
+    @staticmethod
+    def _parse_atf_utc(s: str) -> datetime:
+        """Parse a fixed-width YYYY-MM-DDTHH:MM:SSZ timestamp.
+        
+        Raises ValueError for anything else, like strptime would. The layout
+        is checked here; fromisoformat then parses the fields, rejecting
+        non-ASCII digits and out-of-range values.
+        """
+        if (len(s) != 20 or s[4] != '-' or s[7] != '-' or s[10] != 'T'
+                or s[13] != ':' or s[16] != ':' or s[19] != 'Z'):
+            raise ValueError(f"time data {s!r} is not in ATF format")
+        return datetime.fromisoformat(s[:19])
+
+    def _validate_percentages(self, elements: Elements) -> List[str]:
+        """Validate percentage format in affected users."""
         errors = []
-        percentage_pattern = re.compile(r'^\d+(\.\d+)?%$')
+        percentage_pattern = self.PERCENTAGE_PATTERN
         
-        # Check affected users percentages
-        for affected in doc.findall(".//{*}affectedUsers"):
-            if not percentage_pattern.match(affected.text):
-                errors.append(f"Invalid percentage format in affectedUsers: {affected.text}")
+        # Values repeat across items, so each distinct one is matched once
+        is_percentage: Dict[str, bool] = {}
         
-        # Check metric percentages
-        for metric in doc.findall(".//{*}metric"):
-            if '%' in metric.text and not percentage_pattern.match(metric.text):
-                errors.append(f"Invalid percentage format in metric: {metric.text}")
+        # Check affected users percentages
+        for affected in elements['affectedUsers']:
+            text = affected.text
+            if not text:
+                errors.append("Missing value for affectedUsers")
+                continue
+            valid = is_percentage.get(text)
+            if valid is None:
+                valid = is_percentage[text] = percentage_pattern.match(text) is not None
+            if not valid:
+                errors.append(f"Invalid percentage format in affectedUsers: {text}")
         
         return errors
 
-    def _validate_metrics(self, doc: etree._ElementTree) -> List[str]:
-        """Validate metric formats and consistency."""
-        errors = []
-        metric_patterns = {
-            'percentage': re.compile(r'^[+-]?\d+(\.\d+)?%$'),
-            'numeric': re.compile(r'^[+-]?\d+(\.\d+)?$'),
-            'ratio': re.compile(r'^\d+:\d+$'),
-            'duration': re.compile(r'^\d+(\.\d+)?(ms|s|min|h)$'),
-            'boolean': re.compile(r'^(true|false)$', re.I)
-        }
+    def _validate_metrics(self, elements: Elements) -> Tuple[List[str], List[str]]:
+        """Validate metric formats and consistency.
         
-        seen_metrics: Dict[str, Set[str]] = {}
+        Returns the percentage-format errors and the other metric errors
+        separately, so they can be reported in their usual order.
+        """
+        percentage_errors = []
+        errors = []
+        # Format first observed for each metric name
+        seen_metrics: Dict[str, str] = {}
         
-        for metric in doc.findall(".//{*}metric"):
+        for metric in elements['metric']:
             name = metric.get('name')
             value = metric.text
+            if not value:
+                errors.append(f"Missing value for metric {name}")
+                continue
             
-            # Check if any pattern matches
-            valid_format = any(pattern.match(value) for pattern in metric_patterns.values())
-            if not valid_format:
+            # First matching pattern wins (see _metric_format_type)
+            format_type = _metric_format_type(value)
+            if format_type == 'unknown':
                 errors.append(f"Invalid metric format: {name}={value}")
             
+            # Percentages must also be unsigned, as PERCENTAGE_PATTERN requires
+            if '%' in value and (format_type != 'percentage' or value[0] in '+-'):
+                percentage_errors.append(f"Invalid percentage format in metric: {value}")
+            
             # Check consistency of metric formats across items
-            if name in seen_metrics:
-                format_type = self._get_metric_format_type(value, metric_patterns)
-                if format_type not in seen_metrics[name]:
-                    errors.append(f"Inconsistent format for metric {name}: {value}")
-            else:
-                seen_metrics[name] = {self._get_metric_format_type(value, metric_patterns)}
+            seen_format = seen_metrics.setdefault(name, format_type)
+            if seen_format != format_type:
+                errors.append(f"Inconsistent format for metric {name}: {value}")
         
-        return errors
+        return percentage_errors, errors
 
-    def _get_metric_format_type(self, value: str, patterns: Dict[str, re.Pattern]) -> str:
-        """Determine the format type of a metric value."""
-        for format_type, pattern in patterns.items():
-            if pattern.match(value):
-                return format_type
-        return 'unknown'
-
-    def _validate_categories(self, doc: etree._ElementTree) -> List[str]:
+    def _validate_categories(self, elements: Elements) -> List[str]:
         """Validate category names and usage."""
         errors = []
-        categories_used = set()
+        standard_categories = self.STANDARD_CATEGORIES
+        
+        # Category names repeat across items, so each is format-checked once
+        valid_names: Dict[str, bool] = {}
         
-        for category in doc.findall(".//{*}category"):
-            cat_name = category.text.strip()
-            categories_used.add(cat_name)
+        for category in elements['category']:
+            # Each .text access builds a new string from the tree, so read it once
+            text = category.text
+            if not text:
+                errors.append("Missing value for category")
+                continue
+            cat_name = text.strip()
             
             # Check against standard categories
-            if cat_name not in self.STANDARD_CATEGORIES:
+            if cat_name not in standard_categories:
                 errors.append(f"Non-standard category used: {cat_name}")
             
             # Check category name format
-            if not re.match(r'^[A-Z][a-zA-Z0-9 ]+$', cat_name):
+            valid = valid_names.get(cat_name)
+            if valid is None:
+                valid = valid_names[cat_name] = self.CATEGORY_NAME_PATTERN.match(cat_name) is not None
+            if not valid:
                 errors.append(f"Invalid category name format: {cat_name}")
         
         return errors
 
-    def _validate_language(self, doc: etree._ElementTree) -> List[str]:
+    def _validate_language(self, elements: Elements) -> List[str]:
         """Validate language codes."""
         errors = []
-        lang_elem = doc.find(".//{*}language")
-        if lang_elem is not None and lang_elem.text not in self.ALLOWED_LANGUAGES:
-            errors.append(f"Unsupported language code: {lang_elem.text}")
+        languages = elements['language']
+        lang_elem = languages[0] if languages else None
+        if lang_elem is not None:
+            text = lang_elem.text
+            if not text:
+                errors.append("Missing value for language")
+            # Language tags are case-insensitive
+            elif text.strip().lower() not in self.ALLOWED_LANGUAGES:
+                errors.append(f"Unsupported language code: {text}")
         return errors
 
-    def _validate_retention(self, doc: etree._ElementTree) -> List[str]:
-        """Validate feed history retention."""
+    def _validate_retention(self, pub_dates: List[datetime]) -> List[str]:
+        """Validate feed history retention from the parsed publication dates."""
         errors = []
         current_date = datetime.utcnow()
         
-        # Get all publication dates
-        pub_dates = []
-        for date_elem in doc.findall(".//{*}pubDate"):
-            try:
-                pub_date = datetime.strptime(date_elem.text, "%Y-%m-%dT%H:%M:%SZ")
-                pub_dates.append(pub_date)
-            except ValueError:
-                continue
-        
         if pub_dates:
             oldest_date = min(pub_dates)
             days_retained = (current_date - oldest_date).days
@@ -190,85 +343,182 @@ class ATFValidator:
         
         return errors
 
-    def _validate_dates(self, doc: etree._ElementTree) -> List[str]:
-        """Validate date formats and logical consistency."""
+    def _validate_dates(self, elements: Elements) -> Tuple[List[str], List[datetime]]:
+        """Validate date formats and logical consistency.
+        
+        Returns the errors and the successfully parsed pubDates.
+        """
         errors = []
+        pub_dates = []
         current_date = datetime.utcnow()
+        last_build_date = None
         
         try:
             # Check lastBuildDate
-            last_build = doc.find(".//{*}lastBuildDate")
-            if last_build is not None:
-                try:
-                    last_build_date = datetime.strptime(last_build.text, "%Y-%m-%dT%H:%M:%SZ")
-                    if last_build_date > current_date:
-                        errors.append(f"lastBuildDate is in the future: {last_build.text}")
-                except ValueError:
-                    errors.append(f"Invalid lastBuildDate format: {last_build.text}")
+            last_builds = elements['lastBuildDate']
+            if last_builds:
+                last_build = last_builds[0].text
+                if not last_build:
+                    errors.append("Missing value for lastBuildDate")
+                else:
+                    try:
+                        last_build_date = self._parse_atf_utc(last_build)
+                        if last_build_date > current_date:
+                            errors.append(f"lastBuildDate is in the future: {last_build}")
+                    except ValueError:
+                        errors.append(f"Invalid lastBuildDate format: {last_build}")
             
-            # Check pubDates
-            for pub_date in doc.findall(".//{*}pubDate"):
-                try:
-                    pub_date_obj = datetime.strptime(pub_date.text, "%Y-%m-%dT%H:%M:%SZ")
-                    if pub_date_obj > current_date:
-                        errors.append(f"pubDate is in the future: {pub_date.text}")
-                except ValueError:
-                    errors.append(f"Invalid pubDate format: {pub_date.text}")
+            # Check pubDates. Items often share a date, so each distinct
+            # string is parsed once; None marks an unparseable one.
+            parsed_dates: Dict[str, Optional[datetime]] = {}
+            for pub_date in elements['pubDate']:
+                text = pub_date.text
+                if not text:
+                    errors.append("Missing value for pubDate")
+                    continue
+                if text in parsed_dates:
+                    pub_date_obj = parsed_dates[text]
+                else:
+                    try:
+                        pub_date_obj = self._parse_atf_utc(text)
+                    except ValueError:
+                        pub_date_obj = None
+                    parsed_dates[text] = pub_date_obj
+                if pub_date_obj is None:
+                    errors.append(f"Invalid pubDate format: {text}")
+                    continue
+                pub_dates.append(pub_date_obj)
+                if pub_date_obj > current_date:
+                    errors.append(f"pubDate is in the future: {text}")
+                elif last_build_date is not None and pub_date_obj > last_build_date:
+                    errors.append(f"pubDate is after lastBuildDate: {text}")
         
         except Exception as e:
             errors.append(f"Date validation error: {e}")
         
-        return errors
+        return errors, pub_dates
 
-    def _validate_uris(self, doc: etree._ElementTree) -> List[str]:
+    def _validate_uris(self, elements: Elements) -> List[str]:
         """Validate URI formats and accessibility."""
         errors = []
-        for link in doc.findall(".//{*}link"):
+        fast_match = self.URI_FAST_PATTERN.fullmatch
+        
+        # Problem URIs (placeholders, relative links) tend to repeat across
+        # items, so the detailed checks run once per distinct URI
+        uri_errors: Dict[str, List[str]] = {}
+        
+        for link in elements['link']:
             url = link.text
+            if not url:
+                errors.append("Missing value for link")
+                continue
             
-            # Basic URL format validation
-            if not url.startswith(('http://', 'https://')):
-                errors.append(f"Invalid URI scheme: {url}")
+            # Common case: nothing below can fail for this URI
+            if fast_match(url):
                 continue
             
-            # Parse URL for additional validation
-            try:
-                parsed = urllib.parse.urlparse(url)
-                if not all([parsed.scheme, parsed.netloc]):
-                    errors.append(f"Invalid URI format: {url}")
-                
-                # Check for common issues
-                if ' ' in url:
-                    errors.append(f"URI contains spaces: {url}")
-                if not parsed.netloc.count('.'):
-                    errors.append(f"Invalid domain in URI: {url}")
-                
-            except Exception as e:
-                errors.append(f"URI parsing error for {url}: {e}")
+            found = uri_errors.get(url)
+            if found is None:
+                found = uri_errors[url] = self._check_uri(url)
+            errors.extend(found)
         
         return errors
 
+    @staticmethod
+    def _check_uri(url: str) -> List[str]:
+        """Run the detailed checks on a URI the fast pattern did not accept."""
+        # Basic URL format validation
+        if not url.startswith(('http://', 'https://')):
+            return [f"Invalid URI scheme: {url}"]
+        
+        # Parse URL for additional validation
+        errors = []
+        try:
+            parsed = urllib.parse.urlparse(url)
+            if not (parsed.scheme and parsed.netloc):
+                errors.append(f"Invalid URI format: {url}")
+            
+            # Check for common issues
+            if ' ' in url:
+                errors.append(f"URI contains spaces: {url}")
+            if not parsed.netloc.count('.'):
+                errors.append(f"Invalid domain in URI: {url}")
+            
+        except Exception as e:
+            errors.append(f"URI parsing error for {url}: {e}")
+        
+        return errors
+
+# Validator of a --jobs worker process, built once by _init_worker
+_worker_validator: Optional[ATFValidator] = None
+
+def _init_worker(schema_path: str, fail_fast: bool, max_errors: Optional[int]):
+    """Build the validator a worker process uses for all its files."""
+    global _worker_validator
+    _worker_validator = ATFValidator(schema_path, fail_fast, max_errors)
+
+def _validate_one(xml_path: str) -> List[str]:
+    """Validate one file in a worker process."""
+    return _worker_validator.validate_file(xml_path)
+
+def _positive_int(value: str) -> int:
+    """Parse a command-line count that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def _print_report(prefix: str, errors: Iterable[str]) -> bool:
+    """Print one file's errors as they arrive; return whether there were any."""
+    failed = False
+    for error in errors:
+        if not failed:
+            failed = True
+            print(f"{prefix}Validation errors found:")
+        print(f"  - {error}")
+    if not failed:
+        print(f"{prefix}Validation successful!")
+    return failed
+
 def main():
     parser = argparse.ArgumentParser(description='Validate ATF XML files')
-    parser.add_argument('xml_file', help='Path to the ATF XML file to validate')
+    parser.add_argument('xml_files', nargs='+', metavar='xml_file',
+                      help='Paths to the ATF XML files to validate, or - to read paths from stdin')
     parser.add_argument('--schema', default='schema/atf-1.0.xsd',
                       help='Path to the ATF schema file')
     parser.add_argument('--verbose', action='store_true',
                       help='Show detailed validation messages')
+    parser.add_argument('--fail-fast', action='store_true',
+                      help='Skip the enhanced checks for files that fail schema validation')
+    parser.add_argument('--max-errors', type=_positive_int,
+                      help='Stop validating a file after this many errors')
+    parser.add_argument('--jobs', type=_positive_int, default=1,
+                      help='Number of worker processes for validating several files')
     args = parser.parse_args()
     
+    xml_files = args.xml_files
+    if xml_files == ['-']:
+        xml_files = [line.strip() for line in sys.stdin if line.strip()]
+        if not xml_files:
+            parser.error("no XML file paths read from stdin")
+    
     try:
-        validator = ATFValidator(args.schema)
-        errors = validator.validate_file(args.xml_file)
-        
-        if errors:
-            print("Validation errors found:")
-            for error in errors:
-                print(f"  - {error}")
-            sys.exit(1)
+        # One validator for the whole batch, so the schema is compiled once
+        validator = ATFValidator(args.schema, args.fail_fast, args.max_errors)
+        prefixes = [f"{xml_file}: " if len(xml_files) > 1 else "" for xml_file in xml_files]
+        failed = False
+        if args.jobs > 1 and len(xml_files) > 1:
+            # Files are independent; each worker compiles the schema once and
+            # takes files in chunks to keep inter-process traffic down
+            with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                                     initargs=(args.schema, args.fail_fast, args.max_errors)) as pool:
+                for prefix, errors in zip(prefixes, pool.map(_validate_one, xml_files, chunksize=16)):
+                    failed |= _print_report(prefix, errors)
         else:
-            print("Validation successful!")
-            sys.exit(0)
+            # Errors are printed as each check produces them
+            for prefix, xml_file in zip(prefixes, xml_files):
+                failed |= _print_report(prefix, validator.iter_file_errors(xml_file))
+        sys.exit(1 if failed else 0)
     
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)